@@ -3,18 +3,30 @@ from fastapi import (
     Depends,
     HTTPException,
     status,
-    BackgroundTasks,
     Header,
     Form,
     UploadFile,
     File,
+    Response,
+    Query,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session, selectinload, joinedload
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, delete, func, cast, case, Integer, Date
+from sqlalchemy.orm import (
+    Session,
+    selectinload,
+    joinedload,
+    raiseload,
+    contains_eager,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional  # <--- CHANGED: Added this import
+from pydantic import TypeAdapter
 from models import (
     get_db,
+    SessionLocal,
     Property,
     UnitType,
     UnitImage,
@@ -28,23 +40,31 @@ from models import (
     Document,
     DocType,
     NotificationLog,
+    CommunicationSetting,
 )
 import schemas
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 import os
-from jose import JWTError, jwt
+from urllib.parse import urlencode
+from jose import JWTError, jwt, jwk
 from datetime import datetime, timedelta
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import secrets
 import sys
-import os
+import json
+import hashlib
+import threading
+import time
+import httpx
+from cachetools import TTLCache
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "notification_service"))
 from notification_service import (
+    configure as configure_notifications,
     send_booking_confirmation,
     send_booking_reminder,
     send_payment_reminder,
@@ -57,13 +77,78 @@ from notification_service import (
     send_welcome_notification,
     send_account_verification_notification,
     send_password_reset_notification,
+    NOTIFICATION_PRIORITIES,
 )
+from message_templates import compile_template, render_template
+from notification_sender import NotificationSender
+from notification_queue import NotificationQueue, DUPLICATE, REJECTED
 
 app = FastAPI(title="Victor Springs API")
 
 # Temporary token storage for Google OAuth
 google_tokens = {}
 
+# Shared async HTTP client for outbound API calls (Google OAuth, WhatsApp
+# bridge health) so connections are pooled and reused across requests
+http_client = httpx.AsyncClient(
+    timeout=10.0, limits=httpx.Limits(max_keepalive_connections=10)
+)
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
+
+
+# Background notification sends go through this so a slow or failing
+# WhatsApp/SMS provider backs off instead of piling up worker threads
+notification_sender = NotificationSender()
+
+
+def record_failed_notification(func, args):
+    """Keep sends that still failed in notification_logs for a later retry"""
+    phone, payload = args
+    db = SessionLocal()
+    try:
+        db.add(
+            NotificationLog(
+                message_type=func.__name__,
+                message_content=payload
+                if isinstance(payload, str)
+                else json.dumps(payload, default=str),
+                recipient_phone=phone,
+                delivery_method="failed",
+                success=False,
+            )
+        )
+        db.commit()
+    except Exception as e:
+        print(f"Failed to record failed notification: {e}")
+    finally:
+        db.close()
+
+
+# Request handlers only enqueue; worker tasks do the sending, so the API's
+# response time doesn't depend on how fast WhatsApp/httpSMS answer. One
+# worker per slot the sender may open, or raising its limit would do nothing
+notification_queue = NotificationQueue(
+    notification_sender,
+    workers=notification_sender.max_concurrency,
+    on_failure=record_failed_notification,
+    priorities=NOTIFICATION_PRIORITIES,
+)
+
+
+@app.on_event("startup")
+async def start_notification_queue():
+    notification_queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_notification_queue():
+    await notification_queue.stop()
+
+
 # Load environment variables
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
@@ -72,6 +157,23 @@ if not SECRET_KEY:
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+GOOGLE_REDIRECT_URI = "http://127.0.0.1:8000/auth/google/callback"
+
+# Google OAuth consent URL only depends on startup config, so build it once
+GOOGLE_AUTH_URL = (
+    "https://accounts.google.com/o/oauth2/auth?"
+    + urlencode(
+        {
+            "response_type": "code",
+            "client_id": GOOGLE_CLIENT_ID,
+            "redirect_uri": GOOGLE_REDIRECT_URI,
+            "scope": "openid email profile",
+            "state": "google",
+        }
+    )
+    if GOOGLE_CLIENT_ID
+    else None
+)
 
 # Cloudinary configuration
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
@@ -116,6 +218,7 @@ app.add_middleware(
     allow_credentials=True,  # Enable credentials for auth headers
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor for admin lists
 )
 print("CORS middleware configured")
 
@@ -136,8 +239,37 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 hours for development
 REFRESH_TOKEN_EXPIRE_DAYS = 7  # 7 days for user convenience
 
+# Signing key and allowed algorithms built once, instead of jose re-parsing
+# SECRET_KEY into a key object on every encode/decode
+JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+JWT_ALGORITHMS = [ALGORITHM]
+
 security = HTTPBearer()
 
+# Enum member -> string value, for serializing rows in list endpoints
+APPOINTMENT_STATUS_VALUES = {member: member.value for member in AppointmentStatus}
+BOOKING_INTENT_VALUES = {member: member.value for member in BookingIntent}
+USER_ROLE_VALUES = {member: member.value for member in UserRole}
+
+# Recently verified access token payloads keyed by a digest of the token, so
+# repeat requests with the same token skip signature verification
+token_cache = TTLCache(maxsize=10000, ttl=5)
+token_cache_lock = threading.Lock()
+
+
+def decode_access_token(token: str) -> dict:
+    """Decode and verify a JWT, reusing the result for a few seconds"""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with token_cache_lock:
+        payload = token_cache.get(key)
+    if payload is not None and payload.get("exp", float("inf")) > time.time():
+        return payload
+
+    payload = jwt.decode(token, JWT_KEY, algorithms=JWT_ALGORITHMS)
+    with token_cache_lock:
+        token_cache[key] = payload
+    return payload
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -145,9 +277,7 @@ def get_current_user(
 ):
     """Get current user from JWT access token"""
     try:
-        payload = jwt.decode(
-            credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM]
-        )
+        payload = decode_access_token(credentials.credentials)
 
         # Ensure this is an access token (for new tokens) or allow old tokens without type
         token_type = payload.get("type")
@@ -159,7 +289,7 @@ def get_current_user(
             raise HTTPException(
                 status_code=401, detail="Invalid authentication credentials"
             )
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = db.get(User, int(user_id))
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         return user
@@ -169,10 +299,17 @@ def get_current_user(
         )
 
 
+def require_admin(current_user: User = Depends(get_current_user)):
+    """Allow only admin users through; used as the dependency on admin routes"""
+    if current_user.role is not UserRole.admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+
 def verify_refresh_token(token: str, db: Session = Depends(get_db)):
     """Verify refresh token and return user"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, JWT_KEY, algorithms=JWT_ALGORITHMS)
 
         # Ensure this is a refresh token (for new tokens) or allow old tokens without type
         token_type = payload.get("type")
@@ -182,7 +319,7 @@ def verify_refresh_token(token: str, db: Session = Depends(get_db)):
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = db.get(User, int(user_id))
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         return user
@@ -197,7 +334,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": int(expire.timestamp()), "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -205,7 +342,7 @@ def create_refresh_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": int(expire.timestamp()), "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -215,39 +352,51 @@ def create_refresh_token(data: dict):
 @app.get("/login/google")
 def login_google():
     """Redirect to Google OAuth"""
-    if not GOOGLE_CLIENT_ID:
+    if not GOOGLE_AUTH_URL:
         raise HTTPException(status_code=500, detail="Google OAuth not configured")
-    google_auth_url = (
-        f"https://accounts.google.com/o/oauth2/auth?"
-        f"response_type=code&"
-        f"client_id={GOOGLE_CLIENT_ID}&"
-        f"redirect_uri=http://127.0.0.1:8000/auth/google/callback&"
-        f"scope=openid email profile&"
-        f"state=google"
-    )
     from fastapi.responses import RedirectResponse
 
-    return RedirectResponse(google_auth_url)
+    return RedirectResponse(GOOGLE_AUTH_URL)
+
+
+def get_or_create_google_user(db: Session, email: str, first_name: str, last_name: str):
+    """Find the user for a Google login, creating a tenant account if needed"""
+    user = db.query(User).filter(User.email == email).first()
+
+    if not user:
+        # Create new user
+        user = User(
+            email=email,
+            phone_number="",  # Google users don't have phone
+            first_name=first_name,
+            last_name=last_name,
+            role=UserRole.tenant,  # Google users are tenants
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+    return user
 
 
 @app.get("/auth/google/callback")
-def auth_google_callback(code: str, state: str = None, db: Session = Depends(get_db)):
+async def auth_google_callback(
+    code: str, state: str = None, db: Session = Depends(get_db)
+):
     """Handle Google OAuth callback"""
     from fastapi.responses import RedirectResponse
 
     try:
         # Exchange code for token
-        import requests
-
         token_url = "https://oauth2.googleapis.com/token"
         data = {
             "client_id": GOOGLE_CLIENT_ID,
             "client_secret": GOOGLE_CLIENT_SECRET,
             "code": code,
             "grant_type": "authorization_code",
-            "redirect_uri": "http://127.0.0.1:8000/auth/google/callback",
+            "redirect_uri": GOOGLE_REDIRECT_URI,
         }
-        token_response = requests.post(token_url, data=data)
+        token_response = await http_client.post(token_url, data=data)
         token_response.raise_for_status()
         token_data = token_response.json()
         access_token = token_data["access_token"]
@@ -255,7 +404,7 @@ def auth_google_callback(code: str, state: str = None, db: Session = Depends(get
         # Get user info
         user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {access_token}"}
-        user_response = requests.get(user_info_url, headers=headers)
+        user_response = await http_client.get(user_info_url, headers=headers)
         user_response.raise_for_status()
         user_info = user_response.json()
 
@@ -263,37 +412,25 @@ def auth_google_callback(code: str, state: str = None, db: Session = Depends(get
         first_name = user_info.get("given_name", "")
         last_name = user_info.get("family_name", "")
 
-        # Check if user exists
-        user = db.query(User).filter(User.email == email).first()
-
-        if not user:
-            # Create new user
-            user = User(
-                email=email,
-                phone_number="",  # Google users don't have phone
-                first_name=first_name,
-                last_name=last_name,
-                role=UserRole.tenant,  # Google users are tenants
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+        # Database access is blocking, keep it off the event loop
+        user = await run_in_threadpool(
+            get_or_create_google_user, db, email, first_name, last_name
+        )
 
         # Create both access and refresh tokens
-        access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role.value}
-        )
-        refresh_token = create_refresh_token(
-            data={"sub": str(user.id), "role": user.role.value}
-        )
+        user_id = user.id
+        role_value = user.role.value
+        token_data = {"sub": str(user_id), "role": role_value}
+        access_token = create_access_token(data=token_data)
+        refresh_token = create_refresh_token(data=token_data)
 
         # Store token data with a short code
         code = secrets.token_urlsafe(16)
         google_tokens[code] = {
             "access_token": access_token,
             "refresh_token": refresh_token,
-            "role": user.role.value,
-            "user_id": user.id,
+            "role": role_value,
+            "user_id": user_id,
         }
 
         # Redirect to frontend with code
@@ -348,13 +485,14 @@ def refresh_access_token(request: dict, db: Session = Depends(get_db)):
 @app.get("/users/me")
 def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
+    first_name = current_user.first_name
     return {
         "id": current_user.id,
         "email": current_user.email,
-        "first_name": current_user.first_name,
+        "first_name": first_name,
         "last_name": current_user.last_name,
         "role": current_user.role.value,
-        "username": current_user.first_name,  # Using first_name as username for now
+        "username": first_name,  # Using first_name as username for now
         "phone_number": current_user.phone_number,
     }
 
@@ -440,48 +578,58 @@ def login(
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
     # Create both access and refresh tokens
-    access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role.value}
-    )
-    refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "role": user.role.value}
-    )
+    user_id = user.id
+    role_value = user.role.value
+    token_data = {"sub": str(user_id), "role": role_value}
+    access_token = create_access_token(data=token_data)
+    refresh_token = create_refresh_token(data=token_data)
 
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
         "token_type": "bearer",
         "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
-        "user_id": user.id,
-        "role": user.role.value,
+        "user_id": user_id,
+        "role": role_value,
     }
 
 
 # --- GET REQUESTS (Reading Data) ---
 
 
+# Validates and serializes the catalog in pydantic-core, so the nested units
+# and images skip FastAPI's jsonable_encoder pass and the stdlib json encoder
+property_list_adapter = TypeAdapter(List[schemas.PropertyBase])
+
+
 # CHANGED: Used List[...] instead of list[...]
 @app.get("/properties", response_model=List[schemas.PropertyBase])
 def get_properties(db: Session = Depends(get_db)):
     """
     Fetch all properties with their units and images nested inside.
     """
-    properties = db.query(Property).all()
-    return properties
+    properties = (
+        db.query(Property)
+        .options(selectinload(Property.unit_types).selectinload(UnitType.images))
+        .all()
+    )
+    return Response(
+        content=property_list_adapter.dump_json(
+            property_list_adapter.validate_python(properties, from_attributes=True)
+        ),
+        media_type="application/json",
+    )
 
 
 @app.post("/properties", status_code=status.HTTP_201_CREATED)
 def create_property(
     property_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Create a new property (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         new_property = Property(
             name=property_data.get("name"),
@@ -514,17 +662,14 @@ def create_property(
 def update_property(
     property_id: int,
     property_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Update an existing property (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        property_obj = db.query(Property).filter(Property.id == property_id).first()
+        property_obj = db.get(Property, property_id)
         if not property_obj:
             raise HTTPException(status_code=404, detail="Property not found")
 
@@ -559,17 +704,14 @@ def update_property(
 @app.delete("/properties/{property_id}")
 def delete_property(
     property_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Delete a property (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        property_obj = db.query(Property).filter(Property.id == property_id).first()
+        property_obj = db.get(Property, property_id)
         if not property_obj:
             raise HTTPException(status_code=404, detail="Property not found")
 
@@ -588,29 +730,13 @@ def delete_property(
 
 @app.get("/properties/saved")
 def get_saved_properties(
-    Authorization: str = Header(...), db: Session = Depends(get_db)
+    user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """
     Get all properties saved by the current user.
     Based on VenueVibe's simple and working approach.
     """
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        return JSONResponse(content={"detail": "Not authenticated"}, status_code=401)
-
-    token = auth_header.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            return JSONResponse(content={"detail": "Invalid token"}, status_code=401)
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            return JSONResponse(content={"detail": "User not found"}, status_code=404)
-
         # Get saved property IDs first
         saved_property_ids = (
             db.query(SavedProperty.property_id)
@@ -666,8 +792,6 @@ def get_saved_properties(
 
         return JSONResponse(content=result, status_code=200)
 
-    except JWTError:
-        return JSONResponse(content={"detail": "Invalid token"}, status_code=401)
     except Exception as e:
         print(f"Error fetching saved properties: {e}")
         return JSONResponse(
@@ -680,10 +804,17 @@ def get_property_detail(property_id: int, db: Session = Depends(get_db)):
     """
     Fetch specific property details.
     """
-    property = db.query(Property).filter(Property.id == property_id).first()
+    property = db.get(
+        Property,
+        property_id,
+        options=[selectinload(Property.unit_types).selectinload(UnitType.images)],
+    )
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
-    return property
+    return Response(
+        content=schemas.PropertyBase.model_validate(property).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @app.get("/properties/{property_id}/booked-dates")
@@ -693,7 +824,7 @@ def get_property_booked_dates(property_id: int, db: Session = Depends(get_db)):
     For now, return empty list as we don't have booking dates in the current schema.
     """
     # Check if property exists
-    property = db.query(Property).filter(Property.id == property_id).first()
+    property = db.get(Property, property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
 
@@ -717,143 +848,89 @@ def get_user_bookings(
 
 @app.post("/properties/{property_id}/save", status_code=status.HTTP_201_CREATED)
 def save_property(
-    property_id: int, Authorization: str = Header(...), db: Session = Depends(get_db)
+    property_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Save a property for the current user.
     Based on VenueVibe's approach with proper HTTP status codes.
     """
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = Authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Check if property exists
-        property_obj = db.query(Property).filter(Property.id == property_id).first()
-        if not property_obj:
-            raise HTTPException(status_code=404, detail="Property not found")
+    # Check if property exists
+    property_obj = db.get(Property, property_id)
+    if not property_obj:
+        raise HTTPException(status_code=404, detail="Property not found")
 
-        # Check if already saved
-        existing_save = (
-            db.query(SavedProperty)
-            .filter(
-                SavedProperty.user_id == user.id,
-                SavedProperty.property_id == property_id,
-            )
-            .first()
+    # Check if already saved
+    existing_save = (
+        db.query(SavedProperty)
+        .filter(
+            SavedProperty.user_id == user.id,
+            SavedProperty.property_id == property_id,
         )
+        .first()
+    )
 
-        if existing_save:
-            raise HTTPException(status_code=409, detail="Property already saved")
-
-        # Save the property
-        saved_property = SavedProperty(user_id=user.id, property_id=property_id)
-        db.add(saved_property)
-        db.commit()
-        return {"message": "Property saved successfully"}
+    if existing_save:
+        raise HTTPException(status_code=409, detail="Property already saved")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    # Save the property
+    saved_property = SavedProperty(user_id=user.id, property_id=property_id)
+    db.add(saved_property)
+    db.commit()
+    return {"message": "Property saved successfully"}
 
 
 @app.delete("/properties/{property_id}/save")
 def unsave_property(
-    property_id: int, Authorization: str = Header(...), db: Session = Depends(get_db)
+    property_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Remove a property from the user's saved list.
     Based on VenueVibe's approach.
     """
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = Authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Find and delete the saved property
-        saved_property = (
-            db.query(SavedProperty)
-            .filter(
-                SavedProperty.user_id == user.id,
-                SavedProperty.property_id == property_id,
-            )
-            .first()
+    # Find and delete the saved property
+    saved_property = (
+        db.query(SavedProperty)
+        .filter(
+            SavedProperty.user_id == user.id,
+            SavedProperty.property_id == property_id,
         )
+        .first()
+    )
 
-        if not saved_property:
-            raise HTTPException(status_code=404, detail="Property not saved")
-
-        db.delete(saved_property)
-        db.commit()
-        return {"message": "Property unsaved successfully"}
+    if not saved_property:
+        raise HTTPException(status_code=404, detail="Property not saved")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    db.delete(saved_property)
+    db.commit()
+    return {"message": "Property unsaved successfully"}
 
 
 @app.delete("/user/interests/{interest_id}")
 def delete_user_interest(
-    interest_id: int, Authorization: str = Header(...), db: Session = Depends(get_db)
+    interest_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Delete a user interest.
     """
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = Authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Find and delete the interest (only if it belongs to the user)
-        interest = (
-            db.query(VacancyAlert)
-            .filter(VacancyAlert.id == interest_id, VacancyAlert.user_id == user.id)
-            .first()
-        )
-
-        if not interest:
-            raise HTTPException(status_code=404, detail="Interest not found")
+    # Find and delete the interest (only if it belongs to the user)
+    interest = (
+        db.query(VacancyAlert)
+        .filter(VacancyAlert.id == interest_id, VacancyAlert.user_id == user.id)
+        .first()
+    )
 
-        db.delete(interest)
-        db.commit()
-        return {"message": "Interest removed successfully"}
+    if not interest:
+        raise HTTPException(status_code=404, detail="Interest not found")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    db.delete(interest)
+    db.commit()
+    return {"message": "Interest removed successfully"}
 
 
 # --- POST REQUESTS (Creating Data) ---
@@ -863,7 +940,6 @@ def delete_user_interest(
 def book_viewing(
     booking: schemas.BookingRequest,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
 ):
     """
     Smart Booking System:
@@ -886,11 +962,10 @@ def book_viewing(
             role=UserRole.guest,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)  # Get the new ID
+        db.flush()  # Get the new ID; committed together with the appointment
 
     # 2. Check if Unit Type exists
-    unit_type = db.query(UnitType).filter(UnitType.id == booking.unit_type_id).first()
+    unit_type = db.get(UnitType, booking.unit_type_id)
     if not unit_type:
         raise HTTPException(status_code=404, detail="Unit type not found")
 
@@ -905,7 +980,8 @@ def book_viewing(
     db.add(new_appointment)
     db.commit()
 
-    # 4. Send confirmation notification synchronously
+    # 4. Queue confirmation notification so the response isn't held up by it
+    notification_sent = False
     if booking.phone_number:
         # Get property name from unit type
         property_name = (
@@ -915,31 +991,29 @@ def book_viewing(
         booking_data = {
             "venue_name": property_name,
             "event_date": booking.appointment_date.strftime("%Y-%m-%d %H:%M"),
-            "total_cost": unit_type.price or 0,
+            "total_cost": unit_type.price_per_month or 0,
         }
 
-        try:
-            success, method = send_booking_confirmation(
-                booking.phone_number, booking_data
-            )
-            notification_sent = success
-            print(f"Booking confirmation sent via {method}: {success}")
-        except Exception as e:
-            print(f"Failed to send booking confirmation: {e}")
-            notification_sent = False
+        result = notification_queue.enqueue(
+            send_booking_confirmation, booking.phone_number, booking_data
+        )
+        notification_sent = result != REJECTED
 
     return {
         "message": "Appointment booked successfully",
         "appointment_id": new_appointment.id,
-        "notification_sent": bool(background_tasks and booking.phone_number),
+        "notification_sent": notification_sent,
     }
 
 
 @app.post("/property-interest", status_code=status.HTTP_201_CREATED)
-def create_property_interest(request: dict, db: Session = Depends(get_db)):
+def create_property_interest(
+    request: schemas.PropertyInterestRequest,
+    db: Session = Depends(get_db),
+):
     """Create property interest for both signed-in users and guests"""
     try:
-        user_id = request.get("user_id")
+        user_id = request.user_id
         guest_id = None
 
         # If no user_id provided, this is a guest
@@ -948,13 +1022,14 @@ def create_property_interest(request: dict, db: Session = Depends(get_db)):
 
             guest_id = secrets.token_urlsafe(8)  # Generate random guest ID
 
-        # Validate required fields
-        unit_type_id = request.get("unit_type_id")
-        if not unit_type_id:
-            raise HTTPException(status_code=400, detail="Unit type ID is required")
-
         # Check if unit type exists
-        unit_type = db.query(UnitType).filter(UnitType.id == unit_type_id).first()
+        unit_type_id = request.unit_type_id
+        unit_type = (
+            db.query(UnitType)
+            .options(joinedload(UnitType.property))
+            .filter(UnitType.id == unit_type_id)
+            .first()
+        )
         if not unit_type:
             raise HTTPException(status_code=404, detail="Unit type not found")
 
@@ -963,48 +1038,46 @@ def create_property_interest(request: dict, db: Session = Depends(get_db)):
             user_id=user_id,
             guest_id=guest_id,
             unit_type_id=unit_type_id,
-            contact_name=request.get("contact_name"),
-            contact_email=request.get("contact_email"),
-            contact_phone=request.get("contact_phone"),
-            special_requests=request.get("special_requests"),
-            valid_until=datetime.now().date()
-            + timedelta(days=int(request.get("timeframe_months", 3)) * 30),
+            contact_name=request.contact_name,
+            contact_email=request.contact_email,
+            contact_phone=request.contact_phone,
+            special_requests=request.special_requests,
+            # Calendar-month arithmetic in Postgres; refresh() loads the date
+            valid_until=cast(
+                func.current_date() + func.make_interval(0, request.timeframe_months),
+                Date,
+            ),
+        )
+
+        # Read the joined property before commit expires the loaded unit type
+        property_name = (
+            unit_type.property.name if unit_type.property else "Victor Springs Property"
         )
 
         db.add(alert)
         db.commit()
         db.refresh(alert)
 
-        # Send notification if phone provided
-        if request.get("contact_phone"):
-            try:
-                property_name = (
-                    unit_type.property.name
-                    if unit_type and unit_type.property
-                    else "Victor Springs Property"
-                )
-
-                interest_data = {
-                    "contact_name": request.get("contact_name", "Valued Customer"),
-                    "property_name": property_name,
-                    "timeframe": f"{request.get('timeframe_months', 3)} months",
-                    "special_requests": request.get("special_requests", ""),
-                }
+        # Queue notification if phone provided
+        notification_sent = False
+        if request.contact_phone:
+            interest_data = {
+                "contact_name": request.contact_name or "Valued Customer",
+                "property_name": property_name,
+                "timeframe": f"{request.timeframe_months} months",
+                "special_requests": request.special_requests or "",
+            }
 
-                success, method = send_express_interest_notification(
-                    request["contact_phone"], interest_data
-                )
-                notification_sent = success
-                print(f"Express interest notification sent via {method}: {success}")
-            except Exception as e:
-                print(f"Failed to send interest notification: {e}")
-                notification_sent = False
+            result = notification_queue.enqueue(
+                send_express_interest_notification, request.contact_phone, interest_data
+            )
+            notification_sent = result != REJECTED
 
         return {
             "message": "Interest recorded successfully",
             "interest_id": alert.id,
             "guest_id": guest_id,
-            "notification_sent": bool(request.get("contact_phone")),
+            "notification_sent": notification_sent,
         }
 
     except HTTPException:
@@ -1019,14 +1092,13 @@ def create_property_interest(request: dict, db: Session = Depends(get_db)):
 
 @app.post("/site-visits", status_code=status.HTTP_201_CREATED)
 def create_site_visit(
-    request: dict,
+    request: schemas.SiteVisitRequest,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
 ):
     """Create a site visit booking for both registered users and guests"""
     try:
         # 1. Get user_id or create guest_id
-        user_id = request.get("user_id")
+        user_id = request.user_id
         guest_id = None
 
         if not user_id:
@@ -1036,37 +1108,35 @@ def create_site_visit(
             guest_id = secrets.token_urlsafe(8)
         else:
             # Verify user exists if user_id provided
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
         # 2. Get property information
-        property_id = request.get("property_id")
-        if not property_id:
-            raise HTTPException(status_code=400, detail="Property ID is required")
-
-        property = db.query(Property).filter(Property.id == property_id).first()
+        property_id = request.property_id
+        property = db.get(Property, property_id)
         if not property:
             raise HTTPException(status_code=404, detail="Property not found")
 
         # 3. Create appointment for site visit
-        from datetime import datetime
-
-        visit_date_str = request.get("visit_date")
-        visit_time_str = request.get("visit_time")
+        visit_date = request.visit_date
+        visit_time = request.visit_time
 
-        if visit_date_str and visit_time_str:
-            # Combine date and time
-            appointment_datetime = datetime.fromisoformat(
-                f"{visit_date_str}T{visit_time_str}"
-            )
+        if visit_date and visit_time:
+            # Both are already parsed by the schema
+            appointment_datetime = datetime.combine(visit_date, visit_time)
         else:
             raise HTTPException(
                 status_code=400, detail="Visit date and time are required"
             )
 
         # Create appointment (we'll use the first unit type of the property for now)
-        unit_type = property.unit_types[0] if property.unit_types else None
+        unit_type = (
+            db.query(UnitType)
+            .filter(UnitType.property_id == property_id)
+            .order_by(UnitType.id)
+            .first()
+        )
         if not unit_type:
             raise HTTPException(
                 status_code=400, detail="No unit types available for this property"
@@ -1079,7 +1149,7 @@ def create_site_visit(
             appointment_date=appointment_datetime,
             status=AppointmentStatus.pending,
             type=BookingIntent.viewing,
-            admin_notes=f"Site visit request: {request.get('special_requests', '')}",
+            admin_notes=f"Site visit request: {request.special_requests or ''}",
         )
 
         db.add(new_appointment)
@@ -1087,37 +1157,34 @@ def create_site_visit(
         db.refresh(new_appointment)
 
         # 4. Send notification if phone provided
-        if request.get("contact_phone"):
+        notification_sent = False
+        if request.contact_phone:
             # Prepare site visit data for notification
             site_visit_data = {
-                "contact_name": request.get("contact_name", "Valued Customer"),
-                "visit_date": visit_date_str,
-                "visit_time": visit_time_str,
+                "contact_name": request.contact_name or "Valued Customer",
+                "visit_date": visit_date.isoformat(),
+                "visit_time": visit_time.strftime("%H:%M"),
                 "property_name": property.name,
                 "property_address": f"{property.address}, {property.city}"
                 if property.address
                 else f"{property.city}",
-                "special_requests": request.get("special_requests", ""),
+                "special_requests": request.special_requests or "",
             }
 
-            # Send notification synchronously for reliability
-            try:
-                success, method = send_site_visit_request_notification(
-                    request["contact_phone"], site_visit_data
-                )
-                notification_sent = success
-                print(f"Site visit notification sent via {method}: {success}")
-            except Exception as e:
-                print(f"Failed to send site visit notification: {e}")
-                notification_sent = False
+            # Queue the notification so the provider calls don't hold a
+            # worker thread for the length of the request
+            result = notification_queue.enqueue(
+                send_site_visit_request_notification,
+                request.contact_phone,
+                site_visit_data,
+            )
+            notification_sent = result != REJECTED
 
         return {
             "message": "Site visit request submitted successfully",
             "appointment_id": new_appointment.id,
             "guest_id": guest_id,
-            "notification_sent": bool(
-                background_tasks and request.get("contact_phone")
-            ),
+            "notification_sent": notification_sent,
         }
 
     except HTTPException:
@@ -1133,76 +1200,76 @@ def create_site_visit(
 # --- NOTIFICATION ENDPOINTS ---
 
 
-@app.post("/notifications/send-booking-confirmation")
-def send_booking_confirmation_notification(
-    phone: str,
-    venue_name: str,
-    event_date: str,
-    total_cost: float,
-    background_tasks: BackgroundTasks,
-):
-    """
-    Send booking confirmation notification
-    """
-    booking_data = {
-        "venue_name": venue_name,
-        "event_date": event_date,
-        "total_cost": total_cost,
-    }
-
-    # Run in background to not block the API response
-    background_tasks.add_task(send_booking_confirmation, phone, booking_data)
-
-    return {"message": "Booking confirmation notification queued"}
+# Notification kind -> (sender, payload schema); each kind gets its own routes
+NOTIFICATION_SENDERS = {
+    "booking-confirmation": (
+        send_booking_confirmation,
+        schemas.BookingConfirmationNotification,
+    ),
+    "booking-reminder": (send_booking_reminder, schemas.BookingReminderNotification),
+    "payment-reminder": (send_payment_reminder, schemas.PaymentReminderNotification),
+    "site-visit-confirmation": (
+        send_site_visit_confirmation_notification,
+        schemas.SiteVisitConfirmationNotification,
+    ),
+    "site-visit-reminder": (
+        send_site_visit_reminder_notification,
+        schemas.SiteVisitReminderNotification,
+    ),
+    "unit-available": (
+        send_unit_available_notification,
+        schemas.UnitAvailableNotification,
+    ),
+    "welcome": (send_welcome_notification, schemas.WelcomeNotification),
+    "verification": (send_account_verification_notification, schemas.CodeNotification),
+    "password-reset": (send_password_reset_notification, schemas.CodeNotification),
+}
 
 
-@app.post("/notifications/send-booking-reminder")
-def send_booking_reminder_notification(
-    phone: str,
-    venue_name: str,
-    event_date: str,
-    days_until: int,
-    background_tasks: BackgroundTasks,
-):
+def add_notification_routes(kind, sender, schema):
     """
-    Send booking reminder notification
+    Register POST /notifications/send/{kind}, which takes `schema` as a JSON
+    body, and the older /notifications/send-{kind}, which takes the same
+    fields as query parameters
     """
-    booking_data = {
-        "venue_name": venue_name,
-        "event_date": event_date,
-        "days_until": days_until,
-    }
-
-    background_tasks.add_task(send_booking_reminder, phone, booking_data)
-
-    return {"message": "Booking reminder notification queued"}
 
+    def queue_notification(payload, response):
+        result = notification_queue.enqueue(
+            sender, payload.phone, payload.model_dump(exclude={"phone"})
+        )
+        if result == REJECTED:
+            raise HTTPException(
+                status_code=429, detail="Notification queue is full, try again shortly"
+            )
+        if result == DUPLICATE:
+            response.status_code = status.HTTP_200_OK
+            return {"message": f"Notification '{kind}' was already sent or queued"}
+        return {"message": f"Notification '{kind}' queued"}
+
+    @app.post(
+        f"/notifications/send/{kind}",
+        status_code=status.HTTP_202_ACCEPTED,
+        name=f"send_{kind.replace('-', '_')}",
+    )
+    def send_notification(payload: schema, response: Response):
+        return queue_notification(payload, response)
 
-@app.post("/notifications/send-payment-reminder")
-def send_payment_reminder_notification(
-    phone: str,
-    venue_name: str,
-    amount_due: float,
-    due_date: str,
-    background_tasks: BackgroundTasks,
-):
-    """
-    Send payment reminder notification
-    """
-    booking_data = {
-        "venue_name": venue_name,
-        "amount_due": amount_due,
-        "due_date": due_date,
-    }
+    @app.post(
+        f"/notifications/send-{kind}",
+        status_code=status.HTTP_202_ACCEPTED,
+        name=f"send_{kind.replace('-', '_')}_query",
+    )
+    def send_notification_from_query(response: Response, payload: schema = Depends()):
+        return queue_notification(payload, response)
 
-    background_tasks.add_task(send_payment_reminder, phone, booking_data)
 
-    return {"message": "Payment reminder notification queued"}
+for _kind, (_sender, _schema) in NOTIFICATION_SENDERS.items():
+    add_notification_routes(_kind, _sender, _schema)
 
 
-@app.post("/notifications/send-custom")
+@app.post("/notifications/send-custom", status_code=status.HTTP_202_ACCEPTED)
 def send_custom_notification_endpoint(
-    data: dict, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+    data: dict, response: Response, db: Session = Depends(get_db)
 ):
     """
     Send custom notification message
@@ -1214,6 +1281,15 @@ def send_custom_notification_endpoint(
     if not phone or not message:
         raise HTTPException(status_code=400, detail="Phone and message are required")
 
+    result = notification_queue.enqueue(send_custom_notification, phone, message)
+    if result == REJECTED:
+        raise HTTPException(
+            status_code=429, detail="Notification queue is full, try again shortly"
+        )
+    if result == DUPLICATE:
+        response.status_code = status.HTTP_200_OK
+        return {"message": "Custom notification was already sent or queued"}
+
     # Log the notification attempt
     if vacancy_alert_id:
         log_entry = NotificationLog(
@@ -1227,192 +1303,133 @@ def send_custom_notification_endpoint(
         db.add(log_entry)
         db.commit()
 
-    background_tasks.add_task(send_custom_notification, phone, message)
-
     return {"message": "Custom notification queued"}
 
 
-@app.post("/notifications/send-site-visit-confirmation")
-def send_site_visit_confirmation_endpoint(
-    phone: str,
-    contact_name: str,
-    visit_date: str,
-    visit_time: str,
-    property_name: str,
-    property_address: str,
-    background_tasks: BackgroundTasks,
-):
-    """
-    Send site visit confirmation notification
-    """
-    site_visit_data = {
-        "contact_name": contact_name,
-        "visit_date": visit_date,
-        "visit_time": visit_time,
-        "property_name": property_name,
-        "property_address": property_address,
-    }
-
-    background_tasks.add_task(
-        send_site_visit_confirmation_notification, phone, site_visit_data
-    )
-
-    return {"message": "Site visit confirmation notification queued"}
-
+# --- ADMIN COMMUNICATION SETTINGS ---
 
-@app.post("/notifications/send-unit-available")
-def send_unit_available_endpoint(
-    phone: str,
-    contact_name: str,
-    property_name: str,
-    unit_name: str,
-    price: float,
-    background_tasks: BackgroundTasks,
-):
-    """
-    Send unit availability notification
-    """
-    unit_data = {
-        "contact_name": contact_name,
-        "property_name": property_name,
-        "unit_name": unit_name,
-        "price": price,
-    }
+# Settings editable from the admin panel, keyed by their environment variable
+SETTINGS_KEYS = (
+    "ADMIN_WHATSAPP_NUMBER",
+    "HTTPSMS_API_KEY",
+    "SENDER_PHONE",
+    "WHATSAPP_BRIDGE_URL",
+    "TEST_PHONE",
+    "SUPPORT_PHONE",
+    "WEBSITE_URL",
+    "COMPANY_NAME",
+    "SUPPORT_EMAIL",
+    "FLOATING_WIDGET_ENABLED",
+)
 
-    background_tasks.add_task(send_unit_available_notification, phone, unit_data)
+# In-memory settings: environment values, overridden on startup by anything
+# saved in the communication_settings table and kept current on every save
+app_settings = {key: os.environ[key] for key in SETTINGS_KEYS if key in os.environ}
 
-    return {"message": "Unit availability notification queued"}
+# Prebuilt /communication-settings response, cleared whenever settings change
+public_settings_cache = None
 
 
-@app.post("/notifications/send-site-visit-reminder")
-def send_site_visit_reminder_endpoint(
-    phone: str,
-    contact_name: str,
-    visit_date: str,
-    visit_time: str,
-    property_name: str,
-    property_address: str,
-    hours_until: int,
-    background_tasks: BackgroundTasks,
-):
-    """
-    Send site visit reminder notification
-    """
-    reminder_data = {
-        "contact_name": contact_name,
-        "visit_date": visit_date,
-        "visit_time": visit_time,
-        "property_name": property_name,
-        "property_address": property_address,
-        "hours_until": hours_until,
-    }
-
-    background_tasks.add_task(
-        send_site_visit_reminder_notification, phone, reminder_data
+def apply_notification_settings():
+    """Push provider settings to the notification service"""
+    configure_notifications(
+        whatsapp_bridge_url=app_settings.get("WHATSAPP_BRIDGE_URL"),
+        sms_api_key=app_settings.get("HTTPSMS_API_KEY"),
+        sms_sender_phone=app_settings.get("SENDER_PHONE"),
     )
 
-    return {"message": "Site visit reminder notification queued"}
-
-
-@app.post("/notifications/send-welcome")
-def send_welcome_endpoint(
-    phone: str, first_name: str, background_tasks: BackgroundTasks
-):
-    """
-    Send welcome notification to new users
-    """
-    user_data = {
-        "first_name": first_name,
-    }
-
-    background_tasks.add_task(send_welcome_notification, phone, user_data)
-
-    return {"message": "Welcome notification queued"}
 
+@app.on_event("startup")
+def load_app_settings():
+    """Load settings saved from the admin panel into memory"""
+    db = SessionLocal()
+    try:
+        for row in db.query(CommunicationSetting).all():
+            app_settings[row.key] = row.value
+        apply_notification_settings()
+    except Exception as e:
+        print(f"Failed to load saved settings, using environment: {e}")
+    finally:
+        db.close()
 
-@app.post("/notifications/send-verification")
-def send_verification_endpoint(
-    phone: str, code: str, background_tasks: BackgroundTasks
-):
-    """
-    Send account verification notification
-    """
-    verification_data = {
-        "code": code,
-    }
 
-    background_tasks.add_task(
-        send_account_verification_notification, phone, verification_data
+def save_app_settings(db: Session, values: dict):
+    """Upsert settings in one statement and update the in-memory copy"""
+    stmt = pg_insert(CommunicationSetting).values(
+        [{"key": key, "value": value} for key, value in values.items()]
     )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CommunicationSetting.key],
+        set_={"value": stmt.excluded.value, "updated_at": datetime.now()},
+    )
+    db.execute(stmt)
+    db.commit()
+    app_settings.update(values)
 
-    return {"message": "Verification notification queued"}
-
-
-@app.post("/notifications/send-password-reset")
-def send_password_reset_endpoint(
-    phone: str, code: str, background_tasks: BackgroundTasks
-):
-    """
-    Send password reset notification
-    """
-    reset_data = {
-        "code": code,
-    }
-
-    background_tasks.add_task(send_password_reset_notification, phone, reset_data)
+    global public_settings_cache
+    public_settings_cache = None
 
-    return {"message": "Password reset notification queued"}
 
+@app.get("/communication-settings")
+def get_public_communication_settings(response: Response):
+    """Get public communication settings for clients"""
+    global public_settings_cache
+    if public_settings_cache is None:
+        public_settings_cache = build_public_settings()
 
-# --- ADMIN COMMUNICATION SETTINGS ---
+    # Loaded on every page, so let browsers/CDNs reuse it for a few minutes
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return public_settings_cache
 
 
-@app.get("/communication-settings")
-def get_public_communication_settings():
-    """Get public communication settings for clients"""
+def build_public_settings():
+    """Build the public settings payload from the in-memory settings"""
     return {
-        "whatsapp_number": os.getenv("ADMIN_WHATSAPP_NUMBER", "+254754096684"),
-        "support_phone": os.getenv("SUPPORT_PHONE", "+254700000000"),
-        "support_email": os.getenv("SUPPORT_EMAIL", "support@victor-springs.com"),
-        "company_name": os.getenv("COMPANY_NAME", "Victor Springs"),
-        "floating_widget_enabled": os.getenv("FLOATING_WIDGET_ENABLED", "true").lower()
+        "whatsapp_number": app_settings.get("ADMIN_WHATSAPP_NUMBER", "+254754096684"),
+        "support_phone": app_settings.get("SUPPORT_PHONE", "+254700000000"),
+        "support_email": app_settings.get(
+            "SUPPORT_EMAIL", "support@victor-springs.com"
+        ),
+        "company_name": app_settings.get("COMPANY_NAME", "Victor Springs"),
+        "floating_widget_enabled": app_settings.get(
+            "FLOATING_WIDGET_ENABLED", "true"
+        ).lower()
         == "true",
     }
 
 
 @app.get("/admin/communication-settings")
-def get_communication_settings(current_user: User = Depends(get_current_user)):
+def get_communication_settings(current_user: User = Depends(require_admin)):
     """Get current communication settings"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     return {
-        "whatsapp_number": os.getenv("ADMIN_WHATSAPP_NUMBER", ""),
-        "sms_api_key": os.getenv("HTTPSMS_API_KEY", ""),
-        "sms_sender_phone": os.getenv("SENDER_PHONE", ""),
-        "whatsapp_bridge_url": os.getenv(
+        "whatsapp_number": app_settings.get("ADMIN_WHATSAPP_NUMBER", ""),
+        "sms_api_key": app_settings.get("HTTPSMS_API_KEY", ""),
+        "sms_sender_phone": app_settings.get("SENDER_PHONE", ""),
+        "whatsapp_bridge_url": app_settings.get(
             "WHATSAPP_BRIDGE_URL", "http://localhost:3001"
         ),
-        "test_phone": os.getenv("TEST_PHONE", ""),
-        "support_phone": os.getenv("SUPPORT_PHONE", "+254 700 000 000"),
-        "website_url": os.getenv("WEBSITE_URL", "https://victor-springs.com"),
-        "company_name": os.getenv("COMPANY_NAME", "Victor Springs"),
-        "support_email": os.getenv("SUPPORT_EMAIL", "support@victor-springs.com"),
-        "floating_widget_enabled": os.getenv("FLOATING_WIDGET_ENABLED", "true").lower()
+        "test_phone": app_settings.get("TEST_PHONE", ""),
+        "support_phone": app_settings.get("SUPPORT_PHONE", "+254 700 000 000"),
+        "website_url": app_settings.get("WEBSITE_URL", "https://victor-springs.com"),
+        "company_name": app_settings.get("COMPANY_NAME", "Victor Springs"),
+        "support_email": app_settings.get(
+            "SUPPORT_EMAIL", "support@victor-springs.com"
+        ),
+        "floating_widget_enabled": app_settings.get(
+            "FLOATING_WIDGET_ENABLED", "true"
+        ).lower()
         == "true",
     }
 
 
 @app.post("/admin/communication-settings")
 def update_communication_settings(
-    settings: dict, current_user: User = Depends(get_current_user)
+    settings: dict,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
 ):
     """Update communication settings"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
-    # Update environment variables (in a real app, you'd save to database)
-    env_vars = {
+    values = {
         "ADMIN_WHATSAPP_NUMBER": settings.get("whatsapp_number", ""),
         "HTTPSMS_API_KEY": settings.get("sms_api_key", ""),
         "SENDER_PHONE": settings.get("sms_sender_phone", ""),
@@ -1422,47 +1439,24 @@ def update_communication_settings(
         "TEST_PHONE": settings.get("test_phone", ""),
     }
 
-    # Update .env file
-    env_path = os.path.join(os.path.dirname(__file__), ".env")
     try:
-        with open(env_path, "r") as f:
-            lines = f.readlines()
-
-        # Update or add variables
-        updated_lines = []
-        for line in lines:
-            key = line.split("=")[0].strip()
-            if key in env_vars:
-                updated_lines.append(f"{key}={env_vars[key]}\n")
-                del env_vars[key]
-            else:
-                updated_lines.append(line)
-
-        # Add new variables
-        for key, value in env_vars.items():
-            updated_lines.append(f"{key}={value}\n")
-
-        with open(env_path, "w") as f:
-            f.writelines(updated_lines)
+        save_app_settings(db, values)
+        apply_notification_settings()
 
         return {"message": "Communication settings updated successfully"}
     except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=500, detail=f"Failed to update settings: {str(e)}"
         )
 
 
 @app.get("/admin/whatsapp-bridge-status")
-def get_whatsapp_bridge_status(current_user: User = Depends(get_current_user)):
+async def get_whatsapp_bridge_status(current_user: User = Depends(require_admin)):
     """Check WhatsApp bridge connection status"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
-    bridge_url = os.getenv("WHATSAPP_BRIDGE_URL", "http://localhost:3001")
+    bridge_url = app_settings.get("WHATSAPP_BRIDGE_URL", "http://localhost:3001")
     try:
-        import requests
-
-        response = requests.get(f"{bridge_url}/health", timeout=5)
+        response = await http_client.get(f"{bridge_url}/health", timeout=5.0)
         if response.status_code == 200:
             data = response.json()
             return {
@@ -1479,11 +1473,8 @@ def get_whatsapp_bridge_status(current_user: User = Depends(get_current_user)):
 
 
 @app.post("/admin/connect-whatsapp")
-def connect_whatsapp(current_user: User = Depends(get_current_user)):
+def connect_whatsapp(current_user: User = Depends(require_admin)):
     """Generate QR code for WhatsApp connection"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     # In a real implementation, you'd trigger the bridge to generate a new QR code
     # For now, return a placeholder
     return {
@@ -1495,12 +1486,9 @@ def connect_whatsapp(current_user: User = Depends(get_current_user)):
 
 @app.post("/admin/test-connection")
 def test_communication_connection(
-    test_data: dict, current_user: User = Depends(get_current_user)
+    test_data: dict, current_user: User = Depends(require_admin)
 ):
     """Test communication connection by sending a test message"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     phone = test_data.get("phone", "")
     if not phone:
         raise HTTPException(status_code=400, detail="Phone number required")
@@ -1523,51 +1511,144 @@ def test_communication_connection(
 # --- NOTIFICATION MANAGER ENDPOINTS ---
 
 
+def booking_phone_row(booking):
+    """Response item for one row of the bookings-with-phones query"""
+    return {
+        "id": booking.id,
+        "user_name": f"{booking.first_name} {booking.last_name}",
+        "user_email": booking.email,
+        "user_phone": booking.phone_number,
+        "property_name": booking.property_name,
+        "unit_type": booking.unit_type_name,
+        "appointment_date": booking.appointment_date.isoformat(),
+        "notification_status": "pending",  # This would be tracked in a real system
+        "status": "confirmed" if booking.admin_notes else "pending",
+    }
+
+
+def stream_booking_phone_rows(query):
+    """
+    Yield NDJSON lines as rows arrive from a server-side cursor. Uses its own
+    session because the request's one may be closed before streaming ends.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(query.execution_options(yield_per=500))
+        for booking in rows:
+            yield json.dumps(booking_phone_row(booking)) + "\n"
+    finally:
+        db.close()
+
+
 @app.get("/admin/bookings-with-phones")
 def get_bookings_with_phones(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
 ):
-    """Get bookings with user phone numbers for notification management"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
-    try:
-        # Join bookings with users to get phone numbers
-        bookings = db.query(Appointment).join(User).join(UnitType).join(Property).all()
+    """
+    Get bookings with user phone numbers for notification management.
+    Every booking is returned unless `limit` is given. Pages are keyed by
+    booking id: pass the X-Next-Cursor header value back as `cursor` for the
+    next page (or use `offset`). Send `Accept: application/x-ndjson` to stream
+    one booking per line; there the last line's id is the next cursor.
+    """
+    # Join bookings with users to get phone numbers, selecting only the
+    # columns the response needs instead of hydrating full ORM objects
+    query = (
+        select(
+            Appointment.id,
+            User.first_name,
+            User.last_name,
+            User.email,
+            User.phone_number,
+            Property.name.label("property_name"),
+            UnitType.name.label("unit_type_name"),
+            Appointment.appointment_date,
+            Appointment.admin_notes,
+        )
+        .join(Appointment.user)
+        .join(Appointment.unit_type)
+        .join(UnitType.property)
+        .order_by(Appointment.id)
+    )
+    if cursor is not None:
+        # Keyset pagination: seek past the last id instead of scanning
+        query = query.where(Appointment.id > cursor)
+    elif offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
 
-        result = []
-        for booking in bookings:
-            result.append(
-                {
-                    "id": booking.id,
-                    "user_name": f"{booking.user.first_name} {booking.user.last_name}",
-                    "user_email": booking.user.email,
-                    "user_phone": booking.user.phone_number,
-                    "property_name": booking.unit_type.property.name,
-                    "unit_type": booking.unit_type.name,
-                    "appointment_date": booking.appointment_date.isoformat(),
-                    "notification_status": "pending",  # This would be tracked in a real system
-                    "status": "confirmed" if booking.admin_notes else "pending",
-                }
-            )
+    if accept and "application/x-ndjson" in accept:
+        return StreamingResponse(
+            stream_booking_phone_rows(query), media_type="application/x-ndjson"
+        )
 
-        return result
+    try:
+        bookings = db.execute(query).all()
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch bookings: {str(e)}"
         )
 
+    headers = {}
+    if limit is not None and len(bookings) == limit:
+        headers["X-Next-Cursor"] = str(bookings[-1].id)
+    return JSONResponse(
+        content=[booking_phone_row(booking) for booking in bookings], headers=headers
+    )
+
+
+# Static text for the admin booking notifications, parsed once and filled
+# per request
+BOOKING_NOTIFICATION_TEMPLATES = {
+    "confirmation": compile_template(
+        """🏛️ Victor Springs - Booking Confirmed!
+
+Dear {first_name},
+
+Your site visit booking has been confirmed!
+
+📅 Date: {date}
+🏠 Property: {property_name}
+🏢 Unit: {unit_name}
+
+Please arrive 15 minutes early. Our team will be ready to assist you.
+
+Questions? Call us: +254 700 000 000
+
+Thank you for choosing Victor Springs!"""
+    ),
+    "reminder": compile_template(
+        """⏰ Victor Springs - Site Visit Reminder!
+
+Hi {first_name},
+
+This is a reminder about your upcoming site visit:
+
+📅 Date: {date}
+🏠 Property: {property_name}
+🏢 Unit: {unit_name}
+
+Please bring valid ID and any specific requirements mentioned during booking.
+
+See you soon!
+📞 +254 700 000 000"""
+    ),
+}
+
 
 @app.post("/admin/send-notification")
 def send_booking_notification(
     notification_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Send notification to booking customer"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     booking_id = notification_data.get("booking_id")
     if not booking_id:
         raise HTTPException(status_code=400, detail="booking_id is required")
@@ -1582,11 +1663,14 @@ def send_booking_notification(
         # Get booking with user details
         booking = (
             db.query(Appointment)
-            .join(User)
+            .options(
+                joinedload(Appointment.user),
+                joinedload(Appointment.unit_type).joinedload(UnitType.property),
+            )
             .filter(Appointment.id == booking_id)
             .first()
         )
-        if not booking:
+        if not booking or not booking.user:
             raise HTTPException(status_code=404, detail="Booking not found")
 
         phone = booking.user.phone_number
@@ -1594,39 +1678,16 @@ def send_booking_notification(
             raise HTTPException(status_code=400, detail="User has no phone number")
 
         # Prepare message based on type
-        if notification_type == "confirmation":
-            message = f"""🏛️ Victor Springs - Booking Confirmed!
-
-Dear {booking.user.first_name},
-
-Your site visit booking has been confirmed!
-
-📅 Date: {booking.appointment_date.strftime("%Y-%m-%d %H:%M")}
-🏠 Property: {booking.unit_type.property.name}
-🏢 Unit: {booking.unit_type.name}
-
-Please arrive 15 minutes early. Our team will be ready to assist you.
-
-Questions? Call us: +254 700 000 000
-
-Thank you for choosing Victor Springs!"""
-
-        elif notification_type == "reminder":
-            message = f"""⏰ Victor Springs - Site Visit Reminder!
-
-Hi {booking.user.first_name},
-
-This is a reminder about your upcoming site visit:
-
-📅 Date: {booking.appointment_date.strftime("%Y-%m-%d %H:%M")}
-🏠 Property: {booking.unit_type.property.name}
-🏢 Unit: {booking.unit_type.name}
-
-Please bring valid ID and any specific requirements mentioned during booking.
-
-See you soon!
-📞 +254 700 000 000"""
-
+        if notification_type in BOOKING_NOTIFICATION_TEMPLATES:
+            message = render_template(
+                BOOKING_NOTIFICATION_TEMPLATES[notification_type],
+                {
+                    "first_name": booking.user.first_name,
+                    "date": booking.appointment_date.strftime("%Y-%m-%d %H:%M"),
+                    "property_name": booking.unit_type.property.name,
+                    "unit_name": booking.unit_type.name,
+                },
+            )
         elif notification_type == "custom":
             message = custom_message
         else:
@@ -1856,11 +1917,8 @@ Questions? Call us: {support_phone}
 
 
 @app.get("/admin/message-templates")
-def get_message_templates(current_user: User = Depends(get_current_user)):
+def get_message_templates(current_user: User = Depends(require_admin)):
     """Get all message templates"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     # In a real app, you'd load these from database
     # For now, return defaults merged with any customizations
     return DEFAULT_MESSAGE_TEMPLATES
@@ -1870,12 +1928,9 @@ def get_message_templates(current_user: User = Depends(get_current_user)):
 def update_message_template(
     template_key: str,
     template_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
 ):
     """Update a specific message template"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     if template_key not in DEFAULT_MESSAGE_TEMPLATES:
         raise HTTPException(status_code=404, detail="Template not found")
 
@@ -1892,29 +1947,26 @@ def update_message_template(
 
 
 @app.get("/admin/global-settings")
-def get_global_settings(current_user: User = Depends(get_current_user)):
+def get_global_settings(current_user: User = Depends(require_admin)):
     """Get global settings used in message templates"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     return {
-        "support_phone": os.getenv("SUPPORT_PHONE", "+254 700 000 000"),
-        "website_url": os.getenv("WEBSITE_URL", "https://victor-springs.com"),
-        "company_name": os.getenv("COMPANY_NAME", "Victor Springs"),
-        "support_email": os.getenv("SUPPORT_EMAIL", "support@victor-springs.com"),
+        "support_phone": app_settings.get("SUPPORT_PHONE", "+254 700 000 000"),
+        "website_url": app_settings.get("WEBSITE_URL", "https://victor-springs.com"),
+        "company_name": app_settings.get("COMPANY_NAME", "Victor Springs"),
+        "support_email": app_settings.get(
+            "SUPPORT_EMAIL", "support@victor-springs.com"
+        ),
     }
 
 
 @app.post("/admin/global-settings")
 def update_global_settings(
-    settings: dict, current_user: User = Depends(get_current_user)
+    settings: dict,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
 ):
     """Update global settings"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
-    # Update environment variables
-    env_vars = {
+    values = {
         "SUPPORT_PHONE": settings.get("support_phone", "+254 700 000 000"),
         "WEBSITE_URL": settings.get("website_url", "https://victor-springs.com"),
         "COMPANY_NAME": settings.get("company_name", "Victor Springs"),
@@ -1924,103 +1976,91 @@ def update_global_settings(
         ).lower(),
     }
 
-    # Update .env file
-    env_path = os.path.join(os.path.dirname(__file__), ".env")
     try:
-        with open(env_path, "r") as f:
-            lines = f.readlines()
-
-        updated_lines = []
-        for line in lines:
-            key = line.split("=")[0].strip()
-            if key in env_vars:
-                updated_lines.append(f"{key}={env_vars[key]}\n")
-                del env_vars[key]
-            else:
-                updated_lines.append(line)
-
-        # Add new variables
-        for key, value in env_vars.items():
-            updated_lines.append(f"{key}={value}\n")
-
-        with open(env_path, "w") as f:
-            f.writelines(updated_lines)
+        save_app_settings(db, values)
 
         return {"message": "Global settings updated successfully"}
     except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=500, detail=f"Failed to update settings: {str(e)}"
         )
 
 
+def select_interest_rows():
+    """Vacancy alert columns with unit type and property names, as plain rows"""
+    return (
+        select(
+            VacancyAlert.id,
+            VacancyAlert.user_id,
+            VacancyAlert.guest_id,
+            Property.id.label("property_id"),
+            Property.name.label("property_name"),
+            UnitType.name.label("unit_type_name"),
+            VacancyAlert.contact_name,
+            VacancyAlert.contact_email,
+            VacancyAlert.contact_phone,
+            VacancyAlert.special_requests,
+            # Dates come back as ISO 8601 strings ready for the JSON response
+            func.to_char(VacancyAlert.valid_until, "YYYY-MM-DD").label("valid_until"),
+            # Whole 30-day periods left, floored like Python's // on days
+            cast(
+                func.floor((VacancyAlert.valid_until - func.current_date()) / 30.0),
+                Integer,
+            ).label("timeframe_months"),
+            # Like datetime.isoformat(), the fraction is left off on whole seconds
+            func.to_char(
+                VacancyAlert.created_at,
+                case(
+                    (
+                        func.date_trunc("second", VacancyAlert.created_at)
+                        == VacancyAlert.created_at,
+                        'YYYY-MM-DD"T"HH24:MI:SS',
+                    ),
+                    else_='YYYY-MM-DD"T"HH24:MI:SS.US',
+                ),
+            ).label("created_at"),
+            VacancyAlert.is_active,
+        )
+        .outerjoin(UnitType, VacancyAlert.unit_type_id == UnitType.id)
+        .outerjoin(Property, UnitType.property_id == Property.id)
+    )
+
+
 @app.get("/user/interests")
-def get_user_interests(Authorization: str = Header(...), db: Session = Depends(get_db)):
+def get_user_interests(
+    user: User = Depends(get_current_user), db: Session = Depends(get_db)
+):
     """Get property interests for the current user"""
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = Authorization.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Get user's vacancy alerts with related data
-        interests = db.query(VacancyAlert).filter(VacancyAlert.user_id == user.id).all()
-
-        result = []
-        for interest in interests:
-            # Get unit type and property info safely
-            unit_type = (
-                db.query(UnitType).filter(UnitType.id == interest.unit_type_id).first()
-            )
-            property_name = "Unknown Property"
-            unit_type_name = "Unknown Unit"
-
-            if unit_type:
-                unit_type_name = unit_type.name or "Unknown Unit"
-                property_obj = (
-                    db.query(Property)
-                    .filter(Property.id == unit_type.property_id)
-                    .first()
-                )
-                if property_obj:
-                    property_name = property_obj.name or "Unknown Property"
+        # Get user's vacancy alerts with unit type and property names
+        interests = (
+            db.execute(select_interest_rows().where(VacancyAlert.user_id == user.id))
+            .mappings()
+            .all()
+        )
 
-            result.append(
-                {
-                    "id": interest.id,
-                    "user_id": interest.user_id,
-                    "guest_id": interest.guest_id,
-                    "property_id": property_obj.id if property_obj else None,
-                    "property_name": property_name,
-                    "unit_type_name": unit_type_name,
-                    "contact_name": interest.contact_name,
-                    "contact_email": interest.contact_email,
-                    "contact_phone": interest.contact_phone,
-                    "timeframe_months": max(
-                        0, (interest.valid_until - datetime.now().date()).days // 30
-                    ),
-                    "special_requests": interest.special_requests,
-                    "created_at": interest.created_at.isoformat()
-                    if interest.created_at
-                    else None,
-                    "is_active": interest.is_active,
-                }
-            )
+        result = [
+            {
+                "id": interest["id"],
+                "user_id": interest["user_id"],
+                "guest_id": interest["guest_id"],
+                "property_id": interest["property_id"],
+                "property_name": interest["property_name"] or "Unknown Property",
+                "unit_type_name": interest["unit_type_name"] or "Unknown Unit",
+                "contact_name": interest["contact_name"],
+                "contact_email": interest["contact_email"],
+                "contact_phone": interest["contact_phone"],
+                "timeframe_months": max(0, interest["timeframe_months"]),
+                "special_requests": interest["special_requests"],
+                "created_at": interest["created_at"],
+                "is_active": interest["is_active"],
+            }
+            for interest in interests
+        ]
 
         return result
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         print(f"Error fetching user interests: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2028,74 +2068,50 @@ def get_user_interests(Authorization: str = Header(...), db: Session = Depends(g
 
 @app.get("/appointments/my-appointments")
 def get_user_appointments(
-    Authorization: str = Header(...), db: Session = Depends(get_db)
+    user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get appointments for the current user"""
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = Authorization.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Get user's appointments with venue information
+        # Get user's appointments with unit type and property in one query
         appointments = (
-            db.query(Appointment).filter(Appointment.user_id == user.id).all()
+            db.query(Appointment)
+            .options(joinedload(Appointment.unit_type).joinedload(UnitType.property))
+            .options(raiseload("*"))
+            .filter(Appointment.user_id == user.id)
+            .all()
         )
 
         # Add property information to each appointment
-        result = []
-        for appointment in appointments:
-            unit_type = (
-                db.query(UnitType)
-                .filter(UnitType.id == appointment.unit_type_id)
-                .first()
-            )
-            property_name = "Unknown Property"
-            unit_type_name = "Unknown Unit"
-
-            if unit_type:
-                unit_type_name = unit_type.name or "Unknown Unit"
-                property_obj = (
-                    db.query(Property)
-                    .filter(Property.id == unit_type.property_id)
-                    .first()
-                )
-                if property_obj:
-                    property_name = property_obj.name or "Unknown Property"
-
-            appointment_dict = {
+        result = [
+            {
                 "id": appointment.id,
                 "user_id": appointment.user_id,
                 "unit_type_id": appointment.unit_type_id,
                 "appointment_date": appointment.appointment_date.isoformat()
                 if appointment.appointment_date
                 else None,
-                "status": appointment.status.value if appointment.status else "Pending",
-                "type": appointment.type.value if appointment.type else "viewing",
+                "status": APPOINTMENT_STATUS_VALUES.get(appointment.status, "Pending"),
+                "type": BOOKING_INTENT_VALUES.get(appointment.type, "viewing"),
                 "admin_notes": appointment.admin_notes,
                 "created_at": appointment.created_at.isoformat()
                 if appointment.created_at
                 else None,
-                "unit_type_name": unit_type_name,
-                "property_name": property_name,
+                "unit_type_name": (
+                    appointment.unit_type.name if appointment.unit_type else None
+                )
+                or "Unknown Unit",
+                "property_name": (
+                    appointment.unit_type.property.name
+                    if appointment.unit_type and appointment.unit_type.property
+                    else None
+                )
+                or "Unknown Property",
             }
-            result.append(appointment_dict)
+            for appointment in appointments
+        ]
 
         return result
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         print(f"Error fetching user appointments: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2103,90 +2119,58 @@ def get_user_appointments(
 
 @app.delete("/appointments/{appointment_id}")
 def delete_user_appointment(
-    appointment_id: int, Authorization: str = Header(...), db: Session = Depends(get_db)
+    appointment_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """Delete/cancel a user appointment"""
-    # Extract token from Authorization header
-    auth_header = Authorization
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Find and delete the appointment (only if it belongs to the user)
-        appointment = (
-            db.query(Appointment)
-            .filter(Appointment.id == appointment_id, Appointment.user_id == user.id)
-            .first()
-        )
-
-        if not appointment:
-            raise HTTPException(status_code=404, detail="Appointment not found")
+    # Delete the appointment (only if it belongs to the user); RETURNING
+    # tells us in the same statement whether there was one to delete
+    deleted = db.execute(
+        delete(Appointment)
+        .where(Appointment.id == appointment_id, Appointment.user_id == user.id)
+        .returning(Appointment.id)
+    ).first()
+    db.commit()
 
-        db.delete(appointment)
-        db.commit()
-        return {"message": "Appointment cancelled successfully"}
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Appointment not found")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return {"message": "Appointment cancelled successfully"}
 
 
 @app.get("/admin/property-interests")
 def get_property_interests(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get all property interests for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        # Get all vacancy alerts with related data
-        interests = (
-            db.query(VacancyAlert)
-            .options(joinedload(VacancyAlert.unit_type).joinedload(UnitType.property))
-            .all()
-        )
+        # Get all vacancy alerts with unit type and property names
+        interests = db.execute(select_interest_rows()).mappings().all()
 
         print(f"Found {len(interests)} vacancy alerts")
 
+        # Fetch notification history for all interests at once, newest first
+        logs_by_interest = {}
+        if interests:
+            notification_logs = (
+                db.query(NotificationLog)
+                .filter(
+                    NotificationLog.vacancy_alert_id.in_(
+                        [interest["id"] for interest in interests]
+                    )
+                )
+                .order_by(NotificationLog.sent_at.desc())
+                .all()
+            )
+            for log in notification_logs:
+                logs_by_interest.setdefault(log.vacancy_alert_id, []).append(log)
+
         result = []
         for interest in interests:
             try:
-                # Calculate timeframe safely
-                timeframe_months = None
-                if interest.valid_until:
-                    try:
-                        timeframe_months = (
-                            interest.valid_until - datetime.now().date()
-                        ).days // 30
-                    except:
-                        timeframe_months = 0
-
-                # Format created_at safely
-                created_at_str = None
-                if interest.created_at:
-                    try:
-                        created_at_str = interest.created_at.isoformat()
-                    except:
-                        created_at_str = None
-
                 # Get notification history for this interest
-                notification_history = (
-                    db.query(NotificationLog)
-                    .filter(NotificationLog.vacancy_alert_id == interest.id)
-                    .order_by(NotificationLog.sent_at.desc())
-                    .all()
-                )
+                notification_history = logs_by_interest.get(interest["id"], [])
 
                 notifications = []
                 for log in notification_history:
@@ -2201,28 +2185,25 @@ def get_property_interests(
 
                 result.append(
                     {
-                        "id": interest.id,
-                        "user_id": interest.user_id,
-                        "guest_id": interest.guest_id,
-                        "property_name": interest.unit_type.property.name
-                        if interest.unit_type and interest.unit_type.property
-                        else "Unknown Property",
-                        "unit_type_name": interest.unit_type.name
-                        if interest.unit_type
-                        else "Unknown Unit",
-                        "contact_name": interest.contact_name,
-                        "contact_email": interest.contact_email,
-                        "contact_phone": interest.contact_phone,
-                        "timeframe_months": timeframe_months,
-                        "special_requests": interest.special_requests,
-                        "created_at": created_at_str,
-                        "valid_until": interest.valid_until.isoformat() if interest.valid_until else None,
-                        "is_active": interest.is_active,
+                        "id": interest["id"],
+                        "user_id": interest["user_id"],
+                        "guest_id": interest["guest_id"],
+                        "property_name": interest["property_name"]
+                        or "Unknown Property",
+                        "unit_type_name": interest["unit_type_name"] or "Unknown Unit",
+                        "contact_name": interest["contact_name"],
+                        "contact_email": interest["contact_email"],
+                        "contact_phone": interest["contact_phone"],
+                        "timeframe_months": interest["timeframe_months"],
+                        "special_requests": interest["special_requests"],
+                        "created_at": interest["created_at"],
+                        "valid_until": interest["valid_until"],
+                        "is_active": interest["is_active"],
                         "notifications": notifications,
                     }
                 )
             except Exception as e:
-                print(f"Error processing interest {interest.id}: {e}")
+                print(f"Error processing interest {interest['id']}: {e}")
                 continue
 
         return result
@@ -2235,19 +2216,15 @@ def get_property_interests(
 @app.delete("/admin/property-interests/{interest_id}")
 def delete_property_interest(
     interest_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Delete a property interest"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        interest = db.query(VacancyAlert).filter(VacancyAlert.id == interest_id).first()
-        if not interest:
+        deleted = db.execute(delete(VacancyAlert).where(VacancyAlert.id == interest_id))
+        if deleted.rowcount == 0:
             raise HTTPException(status_code=404, detail="Interest not found")
 
-        db.delete(interest)
         db.commit()
 
         return {"message": "Interest deleted successfully"}
@@ -2262,18 +2239,16 @@ def delete_property_interest(
 
 @app.get("/admin/site-visits")
 def get_site_visits(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get all site visits for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         # Get all appointments (site visits) with related data
         appointments = (
             db.query(Appointment)
             .options(joinedload(Appointment.user))
             .options(joinedload(Appointment.unit_type).joinedload(UnitType.property))
+            .options(raiseload("*"))
             .all()
         )
 
@@ -2306,20 +2281,6 @@ def get_site_visits(
                 contact_email = "N/A"
                 contact_phone = "N/A"
                 is_guest = True
-            # Get contact info from user or guest
-            contact_name = ""
-            contact_email = ""
-            contact_phone = ""
-
-            if appointment.user:
-                contact_name = f"{appointment.user.first_name} {appointment.user.last_name}".strip()
-                contact_email = appointment.user.email
-                contact_phone = appointment.user.phone_number
-            else:
-                # For guests, we don't have stored contact info, so we'll show "Guest"
-                contact_name = "Guest User"
-                contact_email = "N/A"
-                contact_phone = "N/A"
 
             result.append(
                 {
@@ -2334,10 +2295,10 @@ def get_site_visits(
                     "appointment_date": appointment.appointment_date.isoformat()
                     if appointment.appointment_date
                     else None,
-                    "status": appointment.status.value
-                    if appointment.status
-                    else "pending",
-                    "type": appointment.type.value if appointment.type else "viewing",
+                    "status": APPOINTMENT_STATUS_VALUES.get(
+                        appointment.status, "pending"
+                    ),
+                    "type": BOOKING_INTENT_VALUES.get(appointment.type, "viewing"),
                     "admin_notes": appointment.admin_notes,
                     "created_at": appointment.created_at.isoformat()
                     if appointment.created_at
@@ -2359,17 +2320,15 @@ def get_site_visits(
 
 @app.get("/admin/site-visits/guests")
 def get_guest_site_visits(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get guest site visits for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         # Get guest appointments (where user_id is None)
         appointments = (
             db.query(Appointment)
             .options(joinedload(Appointment.unit_type).joinedload(UnitType.property))
+            .options(raiseload("*"))
             .filter(Appointment.user_id.is_(None))
             .all()
         )
@@ -2399,10 +2358,10 @@ def get_guest_site_visits(
                     "appointment_date": appointment.appointment_date.isoformat()
                     if appointment.appointment_date
                     else None,
-                    "status": appointment.status.value
-                    if appointment.status
-                    else "pending",
-                    "type": appointment.type.value if appointment.type else "viewing",
+                    "status": APPOINTMENT_STATUS_VALUES.get(
+                        appointment.status, "pending"
+                    ),
+                    "type": BOOKING_INTENT_VALUES.get(appointment.type, "viewing"),
                     "admin_notes": appointment.admin_notes,
                     "created_at": appointment.created_at.isoformat()
                     if appointment.created_at
@@ -2424,18 +2383,16 @@ def get_guest_site_visits(
 
 @app.get("/admin/site-visits/users")
 def get_user_site_visits(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get registered user site visits for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         # Get user appointments (where user_id is not None)
         appointments = (
             db.query(Appointment)
             .options(joinedload(Appointment.user))
             .options(joinedload(Appointment.unit_type).joinedload(UnitType.property))
+            .options(raiseload("*"))
             .filter(Appointment.user_id.isnot(None))
             .all()
         )
@@ -2475,10 +2432,10 @@ def get_user_site_visits(
                     "appointment_date": appointment.appointment_date.isoformat()
                     if appointment.appointment_date
                     else None,
-                    "status": appointment.status.value
-                    if appointment.status
-                    else "pending",
-                    "type": appointment.type.value if appointment.type else "viewing",
+                    "status": APPOINTMENT_STATUS_VALUES.get(
+                        appointment.status, "pending"
+                    ),
+                    "type": BOOKING_INTENT_VALUES.get(appointment.type, "viewing"),
                     "admin_notes": appointment.admin_notes,
                     "created_at": appointment.created_at.isoformat()
                     if appointment.created_at
@@ -2501,18 +2458,12 @@ def get_user_site_visits(
 @app.put("/admin/site-visits/{appointment_id}/approve")
 def approve_site_visit(
     appointment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
 ):
     """Approve a site visit and send confirmation notification"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        appointment = (
-            db.query(Appointment).filter(Appointment.id == appointment_id).first()
-        )
+        appointment = db.get(Appointment, appointment_id)
         if not appointment:
             raise HTTPException(status_code=404, detail="Site visit not found")
 
@@ -2521,32 +2472,31 @@ def approve_site_visit(
         db.commit()
 
         # Send confirmation notification if we have contact info
-        if background_tasks:
-            # Get contact info
-            contact_name = ""
-            contact_phone = ""
+        # Get contact info
+        contact_name = ""
+        contact_phone = ""
 
-            if appointment.user:
-                contact_name = f"{appointment.user.first_name} {appointment.user.last_name}".strip()
-                contact_phone = appointment.user.phone_number
-            # For guests, we don't have stored contact info, so skip notification
+        if appointment.user:
+            contact_name = f"{appointment.user.first_name} {appointment.user.last_name}".strip()
+            contact_phone = appointment.user.phone_number
+        # For guests, we don't have stored contact info, so skip notification
 
-            if contact_phone and contact_name:
-                site_visit_data = {
-                    "contact_name": contact_name,
-                    "visit_date": appointment.appointment_date.strftime("%Y-%m-%d"),
-                    "visit_time": appointment.appointment_date.strftime("%H:%M"),
-                    "property_name": appointment.unit_type.property.name,
-                    "property_address": f"{appointment.unit_type.property.address}, {appointment.unit_type.property.city}"
-                    if appointment.unit_type.property.address
-                    else f"{appointment.unit_type.property.city}",
-                }
+        if contact_phone and contact_name:
+            site_visit_data = {
+                "contact_name": contact_name,
+                "visit_date": appointment.appointment_date.strftime("%Y-%m-%d"),
+                "visit_time": appointment.appointment_date.strftime("%H:%M"),
+                "property_name": appointment.unit_type.property.name,
+                "property_address": f"{appointment.unit_type.property.address}, {appointment.unit_type.property.city}"
+                if appointment.unit_type.property.address
+                else f"{appointment.unit_type.property.city}",
+            }
 
-                background_tasks.add_task(
-                    send_site_visit_confirmation_notification,
-                    contact_phone,
-                    site_visit_data,
-                )
+            notification_queue.enqueue(
+                send_site_visit_confirmation_notification,
+                contact_phone,
+                site_visit_data,
+            )
 
         return {"message": "Site visit approved successfully"}
     except HTTPException:
@@ -2562,17 +2512,12 @@ def approve_site_visit(
 def decline_site_visit(
     appointment_id: int,
     request: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Decline a site visit"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        appointment = (
-            db.query(Appointment).filter(Appointment.id == appointment_id).first()
-        )
+        appointment = db.get(Appointment, appointment_id)
         if not appointment:
             raise HTTPException(status_code=404, detail="Site visit not found")
 
@@ -2601,17 +2546,12 @@ def decline_site_visit(
 @app.delete("/admin/site-visits/{appointment_id}")
 def delete_site_visit(
     appointment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Delete a site visit"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        appointment = (
-            db.query(Appointment).filter(Appointment.id == appointment_id).first()
-        )
+        appointment = db.get(Appointment, appointment_id)
         if not appointment:
             raise HTTPException(status_code=404, detail="Site visit not found")
 
@@ -2630,12 +2570,9 @@ def delete_site_visit(
 
 @app.get("/admin/reports")
 def get_admin_reports(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get admin dashboard reports and statistics"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         # Get basic counts
         total_users = db.query(User).count()
@@ -2677,27 +2614,21 @@ def get_admin_reports(
 
 @app.get("/admin/users")
 def get_all_users(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get all users for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         users = db.query(User).all()
-        result = []
-        for user in users:
-            result.append(
-                {
-                    "id": user.id,
-                    "username": user.first_name or "N/A",
-                    "email": user.email,
-                    "role": user.role.value,
-                    "created_at": user.created_at.isoformat()
-                    if user.created_at
-                    else None,
-                }
-            )
+        result = [
+            {
+                "id": user.id,
+                "username": user.first_name or "N/A",
+                "email": user.email,
+                "role": USER_ROLE_VALUES.get(user.role),
+                "created_at": user.created_at.isoformat() if user.created_at else None,
+            }
+            for user in users
+        ]
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch users: {str(e)}")
@@ -2705,28 +2636,35 @@ def get_all_users(
 
 @app.get("/admin/bookings")
 def get_all_bookings(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get all bookings for admin"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        bookings = db.query(Appointment).join(User).join(UnitType).join(Property).all()
-        result = []
-        for booking in bookings:
-            result.append(
-                {
-                    "id": booking.id,
-                    "user": f"{booking.user.first_name} {booking.user.last_name}",
-                    "venue": booking.unit_type.property.name,
-                    "event_date": booking.appointment_date.isoformat()
-                    if booking.appointment_date
-                    else None,
-                    "status": booking.status.value if booking.status else "Pending",
-                    "payment_status": "Unpaid",  # Placeholder, as payment status not implemented
-                }
+        # Populate user, unit type and property from the joins themselves
+        bookings = (
+            db.query(Appointment)
+            .join(Appointment.user)
+            .join(Appointment.unit_type)
+            .join(UnitType.property)
+            .options(
+                contains_eager(Appointment.user),
+                contains_eager(Appointment.unit_type).contains_eager(UnitType.property),
             )
+            .all()
+        )
+        result = [
+            {
+                "id": booking.id,
+                "user": f"{booking.user.first_name} {booking.user.last_name}",
+                "venue": booking.unit_type.property.name,
+                "event_date": booking.appointment_date.isoformat()
+                if booking.appointment_date
+                else None,
+                "status": APPOINTMENT_STATUS_VALUES.get(booking.status, "Pending"),
+                "payment_status": "Unpaid",  # Placeholder, as payment status not implemented
+            }
+            for booking in bookings
+        ]
         return result
     except Exception as e:
         raise HTTPException(
@@ -2736,12 +2674,9 @@ def get_all_bookings(
 
 @app.get("/reviews")
 def get_reviews(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin), db: Session = Depends(get_db)
 ):
     """Get all reviews for admin moderation"""
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     # Placeholder: return empty list as reviews not implemented
     return []
 
@@ -2751,7 +2686,7 @@ def test_notifications(phone: Optional[str] = None):
     """
     Test notification system with your phone number
     """
-    test_phone = phone or os.getenv("TEST_PHONE", "0754096684")
+    test_phone = phone or app_settings.get("TEST_PHONE", "0754096684")
     test_booking = {
         "venue_name": "Nairobi Arboretum",
         "event_date": "2024-12-15 14:00",
@@ -2774,15 +2709,12 @@ def test_notifications(phone: Optional[str] = None):
 @app.post("/unit-types", status_code=status.HTTP_201_CREATED)
 def create_unit_type(
     unit_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Create a new unit type (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         new_unit = UnitType(
             property_id=unit_data.get("property_id"),
@@ -2818,17 +2750,14 @@ def create_unit_type(
 def update_unit_type(
     unit_type_id: int,
     unit_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Update a unit type (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        unit = db.query(UnitType).filter(UnitType.id == unit_type_id).first()
+        unit = db.get(UnitType, unit_type_id)
         if not unit:
             raise HTTPException(status_code=404, detail="Unit type not found")
 
@@ -2849,20 +2778,68 @@ def update_unit_type(
         )
 
 
+@app.post(
+    "/admin/unit-types/{unit_type_id}/notify-waitlist",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def notify_unit_waitlist(
+    unit_type_id: int,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Tell everyone with an active interest in a unit type that it's available.
+    The whole batch is accepted at once and fed to the workers gradually, so
+    it never crowds out codes and confirmations.
+    """
+    unit_type = db.get(UnitType, unit_type_id, options=[joinedload(UnitType.property)])
+    if not unit_type:
+        raise HTTPException(status_code=404, detail="Unit type not found")
+
+    alerts = db.execute(
+        select(VacancyAlert.contact_name, VacancyAlert.contact_phone).where(
+            VacancyAlert.unit_type_id == unit_type_id,
+            VacancyAlert.is_active.is_(True),
+            VacancyAlert.contact_phone.isnot(None),
+            VacancyAlert.valid_until >= func.current_date(),
+        )
+    ).all()
+
+    unit_data = {
+        "property_name": unit_type.property.name
+        if unit_type.property
+        else "Victor Springs Property",
+        "unit_name": unit_type.name or "Unit",
+        "price": unit_type.price_per_month or 0,
+    }
+    queued = notification_queue.enqueue_many(
+        send_unit_available_notification,
+        [
+            (
+                alert.contact_phone,
+                {**unit_data, "contact_name": alert.contact_name or "Valued Customer"},
+            )
+            for alert in alerts
+        ],
+    )
+
+    message = f"Queued {queued} of {len(alerts)} waitlist notifications"
+    if queued < len(alerts):
+        message += "; the rest were already sent or queued recently"
+    return {"message": message, "queued": queued, "total": len(alerts)}
+
+
 @app.delete("/unit-types/{unit_type_id}")
 def delete_unit_type(
     unit_type_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Delete a unit type (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        unit = db.query(UnitType).filter(UnitType.id == unit_type_id).first()
+        unit = db.get(UnitType, unit_type_id)
         if not unit:
             raise HTTPException(status_code=404, detail="Unit type not found")
 
@@ -2924,15 +2901,12 @@ async def upload_pdf(file: UploadFile = File(...)):
 @app.post("/documents")
 def create_document(
     document_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Create a new document (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         new_document = Document(
             property_id=document_data.get("property_id"),
@@ -2977,18 +2951,17 @@ def get_documents(
 
         documents = query.all()
 
-        result = []
-        for doc in documents:
-            result.append(
-                {
-                    "id": doc.id,
-                    "property_id": doc.property_id,
-                    "unit_type_id": doc.unit_type_id,
-                    "title": doc.title,
-                    "file_url": doc.file_url,
-                    "doc_type": doc.doc_type.value if doc.doc_type else None,
-                }
-            )
+        result = [
+            {
+                "id": doc.id,
+                "property_id": doc.property_id,
+                "unit_type_id": doc.unit_type_id,
+                "title": doc.title,
+                "file_url": doc.file_url,
+                "doc_type": doc.doc_type.value if doc.doc_type else None,
+            }
+            for doc in documents
+        ]
 
         return result
     except Exception as e:
@@ -3000,17 +2973,14 @@ def get_documents(
 @app.delete("/documents/{document_id}")
 def delete_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Delete a document (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        document = db.query(Document).filter(Document.id == document_id).first()
+        document = db.get(Document, document_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
@@ -3033,15 +3003,12 @@ def delete_document(
 @app.post("/unit-images")
 def create_unit_image(
     image_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Create a new unit image association (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         new_image = UnitImage(
             unit_type_id=image_data.get("unit_type_id"),
@@ -3067,17 +3034,14 @@ def create_unit_image(
 @app.delete("/unit-images/{image_id}")
 def delete_unit_image(
     image_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Delete a unit image (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
-        image = db.query(UnitImage).filter(UnitImage.id == image_id).first()
+        image = db.get(UnitImage, image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Unit image not found")
 
@@ -3097,18 +3061,15 @@ def delete_unit_image(
 @app.put("/unit-images/{image_id}/primary")
 def set_primary_image(
     image_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """
     Set a unit image as primary (Admin only)
     """
-    if current_user.role.value != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     try:
         # First, unset all primary images for this unit type
-        image = db.query(UnitImage).filter(UnitImage.id == image_id).first()
+        image = db.get(UnitImage, image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Unit image not found")
 
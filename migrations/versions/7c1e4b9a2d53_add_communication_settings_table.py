@@ -0,0 +1,33 @@
+"""add communication settings table
+
+Revision ID: 7c1e4b9a2d53
+Revises: 2766832f0775
+Create Date: 2026-10-16 10:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9a2d53'
+down_revision: Union[str, None] = '2766832f0775'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create communication_settings table
+    op.create_table('communication_settings',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('value', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    # Drop communication_settings table
+    op.drop_table('communication_settings')
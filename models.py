@@ -13,6 +13,7 @@ from sqlalchemy import (
     Enum,
     create_engine,
 )
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from datetime import datetime
 import enum
@@ -26,13 +27,15 @@ if not DATABASE_URL:
 
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
+    echo=os.getenv("SQL_ECHO", "false").lower() == "true",  # Log SQL when debugging
     pool_pre_ping=True,  # Check connection before using
-    pool_recycle=300,  # Recycle connections every 5 minutes
-    pool_size=10,  # Maximum connections in pool
-    max_overflow=20,  # Allow overflow connections
+    pool_recycle=1800,  # Recycle connections every 30 minutes
+    pool_size=20,  # Persistent connections kept open in the pool
+    max_overflow=40,  # Extra connections allowed under burst load
+    pool_timeout=3,  # Fail fast rather than queue when the pool is exhausted
     connect_args={
-        "connect_timeout": 10,
+        "connect_timeout": 5,
+        "application_name": "victor-springs",  # Identifies us in pg_stat_activity
         # Removed statement_timeout for Neon compatibility
     },
 )
@@ -52,12 +55,13 @@ def get_db():
 def get_db_with_retry(max_retries=3):
     """Get database session with automatic retry on connection failures"""
     for attempt in range(max_retries):
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            # Test the connection
-            db.execute("SELECT 1")
+            # Check out a connection; pool_pre_ping already validates it
+            db.connection()
             return db
-        except Exception as e:
+        except OperationalError as e:
+            db.close()
             if attempt == max_retries - 1:
                 raise e
             print(f"Database connection attempt {attempt + 1} failed, retrying...")
@@ -141,7 +145,7 @@ class Property(Base):
 class UnitType(Base):
     __tablename__ = "unit_types"
     id = Column(Integer, primary_key=True, index=True)
-    property_id = Column(Integer, ForeignKey("properties.id"))
+    property_id = Column(Integer, ForeignKey("properties.id"), index=True)
 
     name = Column(String)
     category = Column(Enum(UnitCategory))
@@ -167,7 +171,7 @@ class UnitType(Base):
 class UnitImage(Base):
     __tablename__ = "unit_images"
     id = Column(Integer, primary_key=True)
-    unit_type_id = Column(Integer, ForeignKey("unit_types.id"))
+    unit_type_id = Column(Integer, ForeignKey("unit_types.id"), index=True)
     cloudinary_public_id = Column(String)
     image_url = Column(String)
     caption = Column(String)
@@ -180,10 +184,10 @@ class Appointment(Base):
     __tablename__ = "appointments"
     id = Column(Integer, primary_key=True)
     user_id = Column(
-        Integer, ForeignKey("users.id"), nullable=True
+        Integer, ForeignKey("users.id"), nullable=True, index=True
     )  # Allow null for guests
     guest_id = Column(String, nullable=True)  # Random ID for guest tracking
-    unit_type_id = Column(Integer, ForeignKey("unit_types.id"))
+    unit_type_id = Column(Integer, ForeignKey("unit_types.id"), index=True)
 
     appointment_date = Column(DateTime)
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.pending)
@@ -201,10 +205,10 @@ class VacancyAlert(Base):
     __tablename__ = "vacancy_alerts"
     id = Column(Integer, primary_key=True)
     user_id = Column(
-        Integer, ForeignKey("users.id"), nullable=True
+        Integer, ForeignKey("users.id"), nullable=True, index=True
     )  # Allow null for guests
-    guest_id = Column(String, nullable=True)  # Random ID for guest tracking
-    unit_type_id = Column(Integer, ForeignKey("unit_types.id"))
+    guest_id = Column(String, nullable=True, index=True)  # Random ID for guest tracking
+    unit_type_id = Column(Integer, ForeignKey("unit_types.id"), index=True)
     contact_name = Column(String, nullable=True)
     contact_email = Column(String, nullable=True)
     contact_phone = Column(String, nullable=True)
@@ -220,7 +224,7 @@ class VacancyAlert(Base):
 class SavedProperty(Base):
     __tablename__ = "saved_properties"
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     property_id = Column(Integer, ForeignKey("properties.id"))
     created_at = Column(DateTime, default=datetime.now)
 
@@ -251,3 +255,10 @@ class NotificationLog(Base):
 
     # Relationships
     vacancy_alert = relationship("VacancyAlert")
+
+
+class CommunicationSetting(Base):
+    __tablename__ = "communication_settings"
+    key = Column(String, primary_key=True)  # e.g. 'SUPPORT_PHONE'
+    value = Column(Text)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -0,0 +1,54 @@
+import threading
+import time
+from notification_logging import log
+
+
+class CircuitBreaker:
+    """
+    Fail fast when a provider keeps failing.
+
+    After `fail_max` consecutive failures the breaker opens and `allow()`
+    returns False for `reset_timeout` seconds. Then a single probe call is let
+    through: success closes the breaker, failure opens it again. Sends run in
+    worker threads, so state changes are guarded by a lock.
+    """
+
+    def __init__(self, name, fail_max=5, reset_timeout=60.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead right now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Half-open: let this one call through to test the provider
+            self._probing = True
+            return True
+
+    def record(self, success):
+        """Report the outcome of a call that allow() let through"""
+        with self._lock:
+            self._probing = False
+            if success:
+                if self.opened_at is not None:
+                    log.info("%s circuit closed", self.name)
+                self.failures = 0
+                self.opened_at = None
+                return
+
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.fail_max:
+                if self.opened_at is None:
+                    log.warning(
+                        "%s circuit opened after %d failures", self.name, self.failures
+                    )
+                self.opened_at = time.monotonic()
@@ -0,0 +1,59 @@
+import os
+import random
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Load environment variables
+load_dotenv()
+
+# How many times a send is retried after the first attempt
+MAXIMUM_RETRIES = int(os.getenv("NOTIFICATION_MAX_RETRIES", "3"))
+
+# Longest a provider's Retry-After may hold a worker thread, in seconds
+MAXIMUM_RETRY_AFTER = 10
+
+
+class JitteredRetry(Retry):
+    """
+    Retry with full jitter: each wait is random between zero and the
+    exponential backoff, so a burst of failed sends doesn't retry in lockstep.
+    A provider's Retry-After is honoured up to MAXIMUM_RETRY_AFTER seconds.
+    """
+
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAXIMUM_RETRY_AFTER)
+
+
+# Shared HTTP session for all outbound notification calls. Reusing one
+# session keeps connections to the WhatsApp bridge and httpSMS alive between
+# messages instead of paying a new TCP/TLS handshake for every send.
+session = requests.Session()
+
+# Sends are POSTs that aren't safe to repeat once the provider may have acted
+# on them, so only failures that happen before that are retried: connection
+# errors, and 429/503 where the provider turned the request away. Read
+# timeouts and other 5xx responses are not retried (read=0), since the
+# message may already have gone out. raise_on_status=False hands the last
+# response back so callers can log it.
+_retry = JitteredRetry(
+    total=MAXIMUM_RETRIES,
+    read=0,
+    backoff_factor=1,
+    backoff_max=30,
+    status_forcelist=[429, 503],
+    allowed_methods=frozenset(["GET", "POST"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128, max_retries=_retry)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
@@ -0,0 +1,31 @@
+import string
+
+_formatter = string.Formatter()
+
+
+def compile_template(template):
+    """
+    Split a str.format template into (literal, field, format_spec) segments
+    once at import, so rendering is a plain join instead of re-parsing the
+    format string on every send
+    """
+    return tuple(
+        (literal, field, spec) for literal, field, spec, _ in _formatter.parse(template)
+    )
+
+
+def render_template(segments, context):
+    """
+    Fill compiled segments from context; a field missing from context
+    renders as an empty string instead of raising KeyError
+    """
+    return "".join(
+        [
+            (
+                literal
+                if field is None or field not in context
+                else literal + format(context[field], spec)
+            )
+            for literal, field, spec in segments
+        ]
+    )
@@ -0,0 +1,21 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Notification modules log through this logger. Records are handed to a
+# background thread that writes them out, so a burst of sends doesn't queue
+# up behind the stdout lock.
+log = logging.getLogger("notifications")
+log.setLevel(logging.INFO)
+log.propagate = False
+
+_handler = logging.StreamHandler()
+_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+
+_log_queue = queue.Queue(-1)
+log.addHandler(QueueHandler(_log_queue))
+
+_listener = QueueListener(_log_queue, _handler)
+_listener.start()
+atexit.register(_listener.stop)
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import threading
+from collections import deque
+from cachetools import TTLCache
+from notification_logging import log
+from sms_gateway import format_phone_number
+
+# Lower numbers are sent first
+PRIORITY_OTP = 0  # Verification / password reset codes that expire
+PRIORITY_TRANSACTIONAL = 1  # Confirmations of something the user just did
+PRIORITY_REMINDER = 2
+PRIORITY_PROMO = 3  # Broadcasts such as unit availability
+
+# What enqueue() did with a send
+QUEUED = "queued"
+DUPLICATE = "duplicate"  # The same send was accepted within dedupe_ttl
+REJECTED = "rejected"  # Queue full or not started; ask the client to retry
+
+
+class NotificationQueue:
+    """
+    Bounded in-memory queue between request handlers and provider sends.
+
+    Handlers call `enqueue`, which returns straight away; `workers` tasks on
+    the event loop drain the queue through a NotificationSender. Once
+    `maxsize` sends are waiting, `enqueue` refuses new ones so the caller can
+    ask the client to retry. Sends that still fail are passed to
+    `on_failure(func, args)` in a worker thread so they can be stored.
+
+    The same notification to the same number within `dedupe_ttl` seconds is
+    not queued again, so a user on two waitlists isn't messaged twice. A send
+    that fails is forgotten, so a retry of it goes out.
+
+    Workers always take the most urgent send waiting: `priorities` maps each
+    send function to a PRIORITY_* level, anything else gets `default_priority`.
+    Sends of equal priority go out in the order they were queued.
+
+    Batches from `enqueue_many` wait in a backlog and are fed into the queue
+    as workers get through them, at most `batch_size` at a time, so a large
+    broadcast never takes the capacity urgent sends need.
+    """
+
+    def __init__(
+        self,
+        sender,
+        maxsize=1000,
+        workers=8,
+        on_failure=None,
+        dedupe_ttl=600,
+        priorities=None,
+        default_priority=PRIORITY_TRANSACTIONAL,
+        batch_size=100,
+    ):
+        self.sender = sender
+        self.maxsize = maxsize
+        self.workers = workers
+        self.on_failure = on_failure
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self.batch_size = batch_size
+
+        self.recent = TTLCache(maxsize=100_000, ttl=dedupe_ttl)
+        self.pending = 0
+        self.batch_pending = 0
+        self._backlog = deque()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+
+    def start(self):
+        """Create the worker tasks; call from the app's startup handler"""
+        self._loop = asyncio.get_event_loop()
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [
+            self._loop.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancel the worker tasks; queued and backlogged sends are dropped"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, func, *args):
+        """
+        Queue func(*args) for sending. Safe to call from sync endpoints running
+        in the threadpool. Returns QUEUED, DUPLICATE if the same send is already
+        queued or went out within `dedupe_ttl`, or REJECTED if the queue is full
+        or not started.
+        """
+        if self._loop is None:
+            log.warning("Notification queue not started, dropping %s", func.__name__)
+            return REJECTED
+
+        key = self._dedupe_key(func, args)
+        with self._lock:
+            if key in self.recent:
+                log.info("Skipping duplicate %s to %s", func.__name__, args[0])
+                return DUPLICATE
+            if self.pending >= self.maxsize:
+                log.warning("Notification queue full, rejecting %s", func.__name__)
+                return REJECTED
+            self.pending += 1
+            self.recent[key] = True
+            sequence = next(self._sequence)
+
+        priority = self.priorities.get(func, self.default_priority)
+        item = (priority, sequence, key, func, args, False)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        return QUEUED
+
+    def enqueue_many(self, func, calls):
+        """
+        Queue func(*args) for every args tuple in `calls`. The batch goes into
+        the backlog, not straight onto the queue, so it is never cut short by
+        a full queue. Returns how many were accepted; duplicates are skipped.
+        """
+        if self._loop is None:
+            log.warning("Notification queue not started, dropping %s", func.__name__)
+            return 0
+
+        priority = self.priorities.get(func, self.default_priority)
+        keyed = [(self._dedupe_key(func, args), args) for args in calls]
+
+        accepted = 0
+        with self._lock:
+            for key, args in keyed:
+                if key in self.recent:
+                    continue
+                self.recent[key] = True
+                self._backlog.append((priority, key, func, args))
+                accepted += 1
+
+        self._loop.call_soon_threadsafe(self._feed)
+        return accepted
+
+    def _feed(self):
+        """Move backlog sends onto the queue while fewer than batch_size wait"""
+        items = []
+        with self._lock:
+            while self._backlog and self.batch_pending < self.batch_size:
+                priority, key, func, args = self._backlog.popleft()
+                self.pending += 1
+                self.batch_pending += 1
+                items.append((priority, next(self._sequence), key, func, args, True))
+
+        for item in items:
+            self._queue.put_nowait(item)
+
+    @staticmethod
+    def _dedupe_key(func, args):
+        """16-byte hash of the normalized phone, the sender and its payload"""
+        phone, payload = args
+        content = json.dumps(
+            [format_phone_number(phone), func.__name__, payload],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    async def _worker(self):
+        while True:
+            _, _, key, func, args, batched = await self._queue.get()
+            with self._lock:
+                self.pending -= 1
+                if batched:
+                    self.batch_pending -= 1
+            if batched:
+                self._feed()
+
+            success = False
+            try:
+                success, method = await self.sender.send(func, *args)
+                if not success and self.on_failure:
+                    await self._loop.run_in_executor(None, self.on_failure, func, args)
+            except Exception as e:
+                log.error("Notification worker error in %s: %s", func.__name__, e)
+            finally:
+                if not success:
+                    # Let a retry of this send through instead of skipping it
+                    with self._lock:
+                        self.recent.pop(key, None)
+                self._queue.task_done()
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import deque
+from functools import partial
+from notification_logging import log
+
+
+class NotificationSender:
+    """
+    Backpressure for provider sends (WhatsApp bridge / httpSMS).
+
+    Concurrency is adjusted AIMD-style: each fast successful send raises the
+    limit by `increase`, while a failed send or one slower than
+    `target_latency` multiplies it by `decrease`. If the failure rate over the
+    last `window` sends exceeds `failure_threshold`, the circuit opens and
+    sends fail immediately for `reset_timeout` seconds. Then a single probe
+    send is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=20,
+        target_latency=2.0,
+        window=50,
+        min_samples=10,
+        failure_threshold=0.5,
+        reset_timeout=30.0,
+        increase=0.5,
+        decrease=0.5,
+    ):
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.increase = increase
+        self.decrease = decrease
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.results = deque(maxlen=window)
+        self.opened_at = None
+        self._probing = False
+        self._condition = None
+
+    def allow(self):
+        """Whether a send may go ahead right now"""
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        # Half-open: let this one send through to test the providers
+        self._probing = True
+        return True
+
+    async def send(self, func, *args):
+        """
+        Run a blocking send_* function in a worker thread within the current
+        concurrency limit. Returns the function's (success, method) result.
+        """
+        if not self.allow():
+            log.warning("Notification circuit open, skipping %s", func.__name__)
+            return False, "circuit_open"
+        probe = self._probing
+
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+        start = time.monotonic()
+        try:
+            loop = asyncio.get_event_loop()
+            success, method = await loop.run_in_executor(None, partial(func, *args))
+        except Exception as e:
+            log.error("Notification error in %s: %s", func.__name__, e)
+            success, method = False, "failed"
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+        self._record(success, time.monotonic() - start, probe)
+        return success, method
+
+    def _record(self, success, latency, probe=False):
+        if probe:
+            self._probing = False
+            if success:
+                log.info("Notification circuit closed")
+                self.opened_at = None
+                self.results.clear()
+            else:
+                self.opened_at = time.monotonic()
+
+        self.results.append(success)
+
+        if success and latency <= self.target_latency:
+            self.limit = min(self.max_concurrency, self.limit + self.increase)
+        else:
+            self.limit = max(1.0, self.limit * self.decrease)
+
+        if self.opened_at is None and len(self.results) >= self.min_samples:
+            failure_rate = self.results.count(False) / len(self.results)
+            if failure_rate > self.failure_threshold:
+                self.opened_at = time.monotonic()
+                log.warning(
+                    "Notification circuit opened (%.0f%% failures)", failure_rate * 100
+                )
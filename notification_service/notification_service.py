@@ -1,6 +1,17 @@
 import os
-import requests
+from functools import lru_cache
 from datetime import datetime
+from http_client import session
+from notification_logging import log
+from circuit_breaker import CircuitBreaker
+from message_templates import compile_template, render_template
+from notification_queue import (
+    PRIORITY_OTP,
+    PRIORITY_TRANSACTIONAL,
+    PRIORITY_REMINDER,
+    PRIORITY_PROMO,
+)
+import sms_gateway
 from sms_gateway import send_sms
 from dotenv import load_dotenv
 
@@ -9,27 +20,62 @@ load_dotenv()
 
 WHATSAPP_BRIDGE_URL = os.getenv("WHATSAPP_BRIDGE_URL", "http://localhost:3001")
 
+# Full endpoint URL, rebuilt by configure() when the bridge URL changes
+WHATSAPP_SEND_URL = f"{WHATSAPP_BRIDGE_URL}/send-whatsapp"
+
+# When the bridge is down, skip straight to SMS instead of waiting out
+# connection attempts and retries for every message
+whatsapp_breaker = CircuitBreaker("WhatsApp bridge", fail_max=5, reset_timeout=60)
+
+# Connect and read timeouts: a bridge that isn't listening is detected fast
+WHATSAPP_TIMEOUT = (2, 10)
+
+# Responses meaning the bridge itself is unavailable rather than one send failing
+BRIDGE_DOWN_STATUSES = frozenset([502, 503, 504])
+
+
+def configure(whatsapp_bridge_url=None, sms_api_key=None, sms_sender_phone=None):
+    """
+    Apply provider settings changed at runtime without restarting the service
+    """
+    global WHATSAPP_BRIDGE_URL, WHATSAPP_SEND_URL
+    if whatsapp_bridge_url is not None:
+        WHATSAPP_BRIDGE_URL = whatsapp_bridge_url
+        WHATSAPP_SEND_URL = f"{WHATSAPP_BRIDGE_URL}/send-whatsapp"
+    sms_gateway.configure(api_key=sms_api_key, sender_phone=sms_sender_phone)
+
 
 def send_whatsapp_message(phone, text):
     """
     Send message via WhatsApp bridge
     """
+    if not whatsapp_breaker.allow():
+        return False, "whatsapp"
+
     try:
-        resp = requests.post(
-            f"{WHATSAPP_BRIDGE_URL}/send-whatsapp",
+        resp = session.post(
+            WHATSAPP_SEND_URL,
             json={"phone": phone, "message": text},
-            timeout=10,
+            timeout=WHATSAPP_TIMEOUT,
         )
-        if resp.status_code == 200:
-            print(f"📱 WhatsApp sent to {phone}")
-            return True, "whatsapp"
-        else:
-            print(f"❌ WhatsApp failed: {resp.text}")
-            return False, "whatsapp"
     except Exception as e:
-        print(f"❌ WhatsApp bridge error: {e}")
+        # Connection errors and timeouts, but anything else raised here must
+        # still be recorded, or a failed half-open probe leaves the breaker
+        # stuck open
+        log.warning("WhatsApp bridge error for %s: %s", phone, e)
+        whatsapp_breaker.record(False)
         return False, "whatsapp"
 
+    # The bridge answers 500 when WhatsApp rejects one recipient; that shows
+    # the bridge is up, so only gateway errors count against the breaker
+    whatsapp_breaker.record(resp.status_code not in BRIDGE_DOWN_STATUSES)
+
+    if resp.status_code == 200:
+        log.debug("WhatsApp sent to %s", phone)
+        return True, "whatsapp"
+    log.warning("WhatsApp to %s failed: %s", phone, resp.text)
+    return False, "whatsapp"
+
 
 def notify_user(phone, message, booking_details=None):
     """
@@ -40,40 +86,29 @@ def notify_user(phone, message, booking_details=None):
         message: The message to send
         booking_details: Optional dict with booking info for logging
     """
-    print(f"\n--- Victor Springs Notification for {phone} ---")
-    print(f"Message: {message[:50]}...")
-
-    if booking_details:
-        print(f"Booking: {booking_details}")
-
     # 1. Try WhatsApp first
-    print("Attempting WhatsApp...")
     wa_success, method = send_whatsapp_message(phone, message)
 
     if wa_success:
-        print("✅ Notification sent via WhatsApp")
+        log.info("Notification to %s sent via WhatsApp", phone)
         return True, "whatsapp"
     else:
         # 2. Fallback to SMS
-        print("WhatsApp failed. Falling back to SMS...")
         sms_success = send_sms(phone, message)
         if sms_success:
-            print("✅ Notification sent via SMS")
+            log.info("Notification to %s sent via SMS", phone)
             return True, "sms"
         else:
-            print("❌ Both WhatsApp and SMS failed")
+            log.error(
+                "Notification to %s failed on WhatsApp and SMS: %s",
+                phone,
+                booking_details or message[:50],
+            )
             return False, "failed"
 
 
-def send_booking_confirmation(phone, booking_data):
-    """
-    Send booking confirmation notification
-    """
-    venue_name = booking_data.get("venue_name", "Venue")
-    event_date = booking_data.get("event_date", "TBD")
-    total_cost = booking_data.get("total_cost", 0)
-
-    message = f"""🏛️ Victor Springs - Booking Confirmed!
+BOOKING_CONFIRMATION_TEMPLATE = compile_template(
+    """🏛️ Victor Springs - Booking Confirmed!
 
 Dear valued customer,
 
@@ -88,19 +123,26 @@ Our team will contact you shortly with additional details.
 Thank you for choosing Victor Springs!
 📞 Support: +254 700 000 000
 """
-
-    return notify_user(phone, message, booking_data)
+)
+BOOKING_CONFIRMATION_DEFAULTS = {
+    "venue_name": "Venue",
+    "event_date": "TBD",
+    "total_cost": 0,
+}
 
 
-def send_booking_reminder(phone, booking_data):
+def send_booking_confirmation(phone, booking_data):
     """
-    Send booking reminder notification
+    Send booking confirmation notification
     """
-    venue_name = booking_data.get("venue_name", "Venue")
-    event_date = booking_data.get("event_date", "TBD")
-    days_until = booking_data.get("days_until", 1)
+    message = render_template(
+        BOOKING_CONFIRMATION_TEMPLATE, {**BOOKING_CONFIRMATION_DEFAULTS, **booking_data}
+    )
+
+    return notify_user(phone, message, booking_data)
+
 
-    message = f"""⏰ Victor Springs - Booking Reminder!
+BOOKING_REMINDER_TEMPLATE = compile_template("""⏰ Victor Springs - Booking Reminder!
 
 Hi there,
 
@@ -115,20 +157,26 @@ Please confirm your availability or contact us if you need to reschedule.
 We're excited to host your special event!
 
 📞 Call us: +254 700 000 000
-"""
+""")
+BOOKING_REMINDER_DEFAULTS = {
+    "venue_name": "Venue",
+    "event_date": "TBD",
+    "days_until": 1,
+}
 
-    return notify_user(phone, message, booking_data)
 
-
-def send_payment_reminder(phone, booking_data):
+def send_booking_reminder(phone, booking_data):
     """
-    Send payment reminder notification
+    Send booking reminder notification
     """
-    venue_name = booking_data.get("venue_name", "Venue")
-    amount_due = booking_data.get("amount_due", 0)
-    due_date = booking_data.get("due_date", "ASAP")
+    message = render_template(
+        BOOKING_REMINDER_TEMPLATE, {**BOOKING_REMINDER_DEFAULTS, **booking_data}
+    )
+
+    return notify_user(phone, message, booking_data)
+
 
-    message = f"""💳 Victor Springs - Payment Reminder!
+PAYMENT_REMINDER_TEMPLATE = compile_template("""💳 Victor Springs - Payment Reminder!
 
 Dear customer,
 
@@ -145,22 +193,23 @@ Contact us immediately if you need assistance.
 Thank you for your prompt attention!
 
 📞 Support: +254 700 000 000
-"""
-
-    return notify_user(phone, message, booking_data)
+""")
+PAYMENT_REMINDER_DEFAULTS = {"venue_name": "Venue", "amount_due": 0, "due_date": "ASAP"}
 
 
-def send_site_visit_request_notification(phone, site_visit_data):
+def send_payment_reminder(phone, booking_data):
     """
-    Send notification when user requests a site visit
+    Send payment reminder notification
     """
-    contact_name = site_visit_data.get("contact_name", "Valued Customer")
-    visit_date = site_visit_data.get("visit_date", "TBD")
-    visit_time = site_visit_data.get("visit_time", "TBD")
-    property_name = site_visit_data.get("property_name", "Victor Springs Property")
-    special_requests = site_visit_data.get("special_requests", "")
+    message = render_template(
+        PAYMENT_REMINDER_TEMPLATE, {**PAYMENT_REMINDER_DEFAULTS, **booking_data}
+    )
 
-    message = f"""🏛️ Victor Springs - Site Visit Request Received!
+    return notify_user(phone, message, booking_data)
+
+
+SITE_VISIT_REQUEST_TEMPLATE = compile_template(
+    """🏛️ Victor Springs - Site Visit Request Received!
 
 Hi {contact_name},
 
@@ -169,7 +218,7 @@ Thank you for your interest in Victor Springs! Your site visit request has been
 📅 Preferred Date: {visit_date}
 ⏰ Preferred Time: {visit_time}
 🏠 Property: {property_name}
-{f"📝 Special Requests: {special_requests}" if special_requests else ""}
+{special_requests_line}
 
 Our team will review your request and confirm the appointment soon. You can track the status by signing into your account at victor-springs.com.
 
@@ -177,21 +226,33 @@ Questions? Call us: +254 700 000 000
 
 Thank you for choosing Victor Springs!
 🌟 Your Dream Home Awaits"""
-
-    return notify_user(phone, message, site_visit_data)
+)
+SITE_VISIT_REQUEST_DEFAULTS = {
+    "contact_name": "Valued Customer",
+    "visit_date": "TBD",
+    "visit_time": "TBD",
+    "property_name": "Victor Springs Property",
+    "special_requests": "",
+}
 
 
-def send_site_visit_confirmation_notification(phone, site_visit_data):
+def send_site_visit_request_notification(phone, site_visit_data):
     """
-    Send notification when admin confirms a site visit
+    Send notification when user requests a site visit
     """
-    contact_name = site_visit_data.get("contact_name", "Valued Customer")
-    visit_date = site_visit_data.get("visit_date", "TBD")
-    visit_time = site_visit_data.get("visit_time", "TBD")
-    property_name = site_visit_data.get("property_name", "Victor Springs Property")
-    property_address = site_visit_data.get("property_address", "Nairobi, Kenya")
+    fields = {**SITE_VISIT_REQUEST_DEFAULTS, **site_visit_data}
+    fields["special_requests_line"] = (
+        f"📝 Special Requests: {fields['special_requests']}"
+        if fields["special_requests"]
+        else ""
+    )
+    message = render_template(SITE_VISIT_REQUEST_TEMPLATE, fields)
+
+    return notify_user(phone, message, site_visit_data)
 
-    message = f"""✅ Victor Springs - Site Visit Confirmed!
+
+SITE_VISIT_CONFIRMATION_TEMPLATE = compile_template(
+    """✅ Victor Springs - Site Visit Confirmed!
 
 Hi {contact_name},
 
@@ -213,20 +274,29 @@ Questions? Call us: +254 700 000 000
 
 We're excited to help you find your perfect home!
 🏡 Victor Springs"""
+)
+SITE_VISIT_CONFIRMATION_DEFAULTS = {
+    "contact_name": "Valued Customer",
+    "visit_date": "TBD",
+    "visit_time": "TBD",
+    "property_name": "Victor Springs Property",
+    "property_address": "Nairobi, Kenya",
+}
 
-    return notify_user(phone, message, site_visit_data)
 
-
-def send_express_interest_notification(phone, interest_data):
+def send_site_visit_confirmation_notification(phone, site_visit_data):
     """
-    Send notification when user expresses interest in a unit
+    Send notification when admin confirms a site visit
     """
-    contact_name = interest_data.get("contact_name", "Valued Customer")
-    property_name = interest_data.get("property_name", "Victor Springs Property")
-    timeframe = interest_data.get("timeframe", "3 months")
-    special_requests = interest_data.get("special_requests", "")
+    message = render_template(
+        SITE_VISIT_CONFIRMATION_TEMPLATE,
+        {**SITE_VISIT_CONFIRMATION_DEFAULTS, **site_visit_data},
+    )
+
+    return notify_user(phone, message, site_visit_data)
 
-    message = f"""💝 Victor Springs - Interest Recorded!
+
+EXPRESS_INTEREST_TEMPLATE = compile_template("""💝 Victor Springs - Interest Recorded!
 
 Hi {contact_name},
 
@@ -234,31 +304,44 @@ Thank you for expressing interest in {property_name}!
 
 ✅ Your interest has been recorded in our system
 ⏰ We'll notify you when units become available within {timeframe}
-{f"📝 Your notes: {special_requests}" if special_requests else ""}
+{special_requests_line}
 
 To track your requests and get updates, please sign in to your account at victor-springs.com.
 
 Questions? Call us: +254 700 000 000
 
 Thank you for choosing Victor Springs!
-🌟 Your Dream Home Journey Starts Here"""
-
-    return notify_user(phone, message, interest_data)
+🌟 Your Dream Home Journey Starts Here""")
+EXPRESS_INTEREST_DEFAULTS = {
+    "contact_name": "Valued Customer",
+    "property_name": "Victor Springs Property",
+    "timeframe": "3 months",
+    "special_requests": "",
+}
 
 
-def send_unit_available_notification(phone, unit_data):
+def send_express_interest_notification(phone, interest_data):
     """
-    Send notification when a unit becomes available for waitlist users
+    Send notification when user expresses interest in a unit
     """
-    contact_name = unit_data.get("contact_name", "Valued Customer")
-    property_name = unit_data.get("property_name", "Victor Springs Property")
-    unit_name = unit_data.get("unit_name", "Unit")
-    price = unit_data.get("price", "TBD")
+    fields = {**EXPRESS_INTEREST_DEFAULTS, **interest_data}
+    fields["special_requests_line"] = (
+        f"📝 Your notes: {fields['special_requests']}"
+        if fields["special_requests"]
+        else ""
+    )
+    message = render_template(EXPRESS_INTEREST_TEMPLATE, fields)
+
+    return notify_user(phone, message, interest_data)
 
-    message = f"""🎉 Victor Springs - Unit Now Available!
 
-Hi {contact_name},
+# Split so the body, the same for every recipient of a broadcast, is only
+# rendered once per unit; just the greeting is built per person
+UNIT_AVAILABLE_GREETING = compile_template("""🎉 Victor Springs - Unit Now Available!
 
+Hi {contact_name},
+""")
+UNIT_AVAILABLE_BODY = compile_template("""
 Exciting news! A unit you're interested in is now available!
 
 🏠 Property: {property_name}
@@ -271,23 +354,39 @@ This is a limited-time availability. Contact us immediately to secure this unit!
 💬 Or reply to this message
 
 Don't miss this opportunity!
-🏡 Victor Springs"""
+🏡 Victor Springs""")
+UNIT_AVAILABLE_DEFAULTS = {
+    "contact_name": "Valued Customer",
+    "property_name": "Victor Springs Property",
+    "unit_name": "Unit",
+    "price": "TBD",
+}
 
-    return notify_user(phone, message, unit_data)
 
+@lru_cache(maxsize=1024)
+def render_unit_available_body(property_name, unit_name, price):
+    return render_template(
+        UNIT_AVAILABLE_BODY,
+        {"property_name": property_name, "unit_name": unit_name, "price": price},
+    )
 
-def send_site_visit_reminder_notification(phone, reminder_data):
+
+def send_unit_available_notification(phone, unit_data):
     """
-    Send reminder notification a few hours before site visit
+    Send notification when a unit becomes available for waitlist users
     """
-    contact_name = reminder_data.get("contact_name", "Valued Customer")
-    visit_date = reminder_data.get("visit_date", "Today")
-    visit_time = reminder_data.get("visit_time", "TBD")
-    property_name = reminder_data.get("property_name", "Victor Springs Property")
-    property_address = reminder_data.get("property_address", "Nairobi, Kenya")
-    hours_until = reminder_data.get("hours_until", 2)
+    fields = {**UNIT_AVAILABLE_DEFAULTS, **unit_data}
+    message = render_template(
+        UNIT_AVAILABLE_GREETING, fields
+    ) + render_unit_available_body(
+        fields["property_name"], fields["unit_name"], fields["price"]
+    )
+
+    return notify_user(phone, message, unit_data)
 
-    message = f"""⏰ Victor Springs - Site Visit Reminder!
+
+SITE_VISIT_REMINDER_TEMPLATE = compile_template(
+    """⏰ Victor Springs - Site Visit Reminder!
 
 Hi {contact_name},
 
@@ -309,17 +408,29 @@ Questions? Call us: +254 700 000 000
 
 See you soon!
 🏡 Victor Springs"""
-
-    return notify_user(phone, message, reminder_data)
+)
+SITE_VISIT_REMINDER_DEFAULTS = {
+    "contact_name": "Valued Customer",
+    "visit_date": "Today",
+    "visit_time": "TBD",
+    "property_name": "Victor Springs Property",
+    "property_address": "Nairobi, Kenya",
+    "hours_until": 2,
+}
 
 
-def send_welcome_notification(phone, user_data):
+def send_site_visit_reminder_notification(phone, reminder_data):
     """
-    Send welcome message to new users
+    Send reminder notification a few hours before site visit
     """
-    first_name = user_data.get("first_name", "Valued Customer")
+    message = render_template(
+        SITE_VISIT_REMINDER_TEMPLATE, {**SITE_VISIT_REMINDER_DEFAULTS, **reminder_data}
+    )
+
+    return notify_user(phone, message, reminder_data)
 
-    message = f"""🎉 Welcome to Victor Springs!
+
+WELCOME_TEMPLATE = compile_template("""🎉 Welcome to Victor Springs!
 
 Hi {first_name},
 
@@ -333,20 +444,23 @@ Welcome to Victor Springs - Your Gateway to Premium Living!
 Explore our properties at victor-springs.com or call us at +254 700 000 000.
 
 Your dream home awaits!
-🏡 Victor Springs"""
-
-    return notify_user(phone, message, user_data)
+🏡 Victor Springs""")
+WELCOME_DEFAULTS = {"first_name": "Valued Customer"}
 
 
-def send_account_verification_notification(phone, verification_data):
+def send_welcome_notification(phone, user_data):
     """
-    Send account verification notification
+    Send welcome message to new users
     """
-    verification_code = verification_data.get("code", "XXXXXX")
+    message = render_template(WELCOME_TEMPLATE, {**WELCOME_DEFAULTS, **user_data})
+
+    return notify_user(phone, message, user_data)
 
-    message = f"""🔐 Victor Springs - Account Verification
 
-Your verification code is: {verification_code}
+ACCOUNT_VERIFICATION_TEMPLATE = compile_template(
+    """🔐 Victor Springs - Account Verification
+
+Your verification code is: {code}
 
 Please enter this code to verify your account.
 
@@ -355,19 +469,25 @@ This code expires in 10 minutes.
 Questions? Call us: +254 700 000 000
 
 🏡 Victor Springs"""
-
-    return notify_user(phone, message, verification_data)
+)
+ACCOUNT_VERIFICATION_DEFAULTS = {"code": "XXXXXX"}
 
 
-def send_password_reset_notification(phone, reset_data):
+def send_account_verification_notification(phone, verification_data):
     """
-    Send password reset notification
+    Send account verification notification
     """
-    reset_code = reset_data.get("code", "XXXXXX")
+    message = render_template(
+        ACCOUNT_VERIFICATION_TEMPLATE,
+        {**ACCOUNT_VERIFICATION_DEFAULTS, **verification_data},
+    )
+
+    return notify_user(phone, message, verification_data)
+
 
-    message = f"""🔑 Victor Springs - Password Reset
+PASSWORD_RESET_TEMPLATE = compile_template("""🔑 Victor Springs - Password Reset
 
-Your password reset code is: {reset_code}
+Your password reset code is: {code}
 
 Use this code to reset your password.
 
@@ -377,7 +497,17 @@ If you didn't request this reset, please ignore this message.
 
 Questions? Call us: +254 700 000 000
 
-🏡 Victor Springs"""
+🏡 Victor Springs""")
+PASSWORD_RESET_DEFAULTS = {"code": "XXXXXX"}
+
+
+def send_password_reset_notification(phone, reset_data):
+    """
+    Send password reset notification
+    """
+    message = render_template(
+        PASSWORD_RESET_TEMPLATE, {**PASSWORD_RESET_DEFAULTS, **reset_data}
+    )
 
     return notify_user(phone, message, reset_data)
 
@@ -389,6 +519,23 @@ def send_custom_notification(phone, message, booking_data=None):
     return notify_user(phone, message, booking_data)
 
 
+# Queue priority for each sender, so codes aren't stuck behind broadcasts
+NOTIFICATION_PRIORITIES = {
+    send_account_verification_notification: PRIORITY_OTP,
+    send_password_reset_notification: PRIORITY_OTP,
+    send_booking_confirmation: PRIORITY_TRANSACTIONAL,
+    send_site_visit_request_notification: PRIORITY_TRANSACTIONAL,
+    send_site_visit_confirmation_notification: PRIORITY_TRANSACTIONAL,
+    send_express_interest_notification: PRIORITY_TRANSACTIONAL,
+    send_custom_notification: PRIORITY_TRANSACTIONAL,
+    send_booking_reminder: PRIORITY_REMINDER,
+    send_payment_reminder: PRIORITY_REMINDER,
+    send_site_visit_reminder_notification: PRIORITY_REMINDER,
+    send_unit_available_notification: PRIORITY_PROMO,
+    send_welcome_notification: PRIORITY_PROMO,
+}
+
+
 # Test function
 if __name__ == "__main__":
     # Test with your number
@@ -1,6 +1,8 @@
 import os
-import requests
 from dotenv import load_dotenv
+from http_client import session
+from notification_logging import log
+from rate_limiter import TokenBucket
 
 # Load environment variables
 load_dotenv()
@@ -9,22 +11,43 @@ load_dotenv()
 ANDROID_API_KEY = os.getenv("HTTPSMS_API_KEY")
 SENDER_PHONE = os.getenv("SENDER_PHONE", "+254754096684")  # Your Airtel number
 
+SMS_SEND_URL = "https://api.httpsms.com/v1/messages/send"
+
+# Stay under the phone's sending rate instead of running into 429s and retries
+SMS_RATE_LIMIT = float(os.getenv("SMS_RATE_LIMIT", "90"))  # messages per second
+sms_bucket = TokenBucket(SMS_RATE_LIMIT)
+
+# Request headers only change when the API key does, so build them once
+HEADERS = {"x-api-key": ANDROID_API_KEY, "Content-Type": "application/json"}
+
+# Connect and read timeouts, so a hung httpSMS call can't hold a worker thread
+SMS_TIMEOUT = (2, 10)
+
+
+def configure(api_key=None, sender_phone=None, timeout=None):
+    """
+    Update httpSMS credentials at runtime (e.g. after an admin settings change)
+    """
+    global ANDROID_API_KEY, SENDER_PHONE, HEADERS, SMS_TIMEOUT
+    if api_key is not None:
+        ANDROID_API_KEY = api_key
+        HEADERS = {"x-api-key": ANDROID_API_KEY, "Content-Type": "application/json"}
+    if sender_phone is not None:
+        SENDER_PHONE = sender_phone
+    if timeout is not None:
+        SMS_TIMEOUT = timeout
+
 
 def send_sms(phone_number, message):
     """
     Send SMS using httpSMS Android app
     """
     if not ANDROID_API_KEY:
-        print("❌ HTTPSMS_API_KEY not found in environment variables")
+        log.error("HTTPSMS_API_KEY not found in environment variables")
         return False
 
-    url = "https://api.httpsms.com/v1/messages/send"
-
     # Ensure phone number is in +254 format
-    if phone_number.startswith("0"):
-        phone_number = "+254" + phone_number[1:]
-    elif not phone_number.startswith("+"):
-        phone_number = "+" + phone_number
+    phone_number = format_phone_number(phone_number)
 
     payload = {
         "content": message,
@@ -32,18 +55,19 @@ def send_sms(phone_number, message):
         "to": phone_number,
     }
 
-    headers = {"x-api-key": ANDROID_API_KEY, "Content-Type": "application/json"}
-
+    sms_bucket.acquire()
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = session.post(
+            SMS_SEND_URL, json=payload, headers=HEADERS, timeout=SMS_TIMEOUT
+        )
         if response.status_code == 200:
-            print(f"✅ SMS sent to {phone_number}")
+            log.debug("SMS sent to %s", phone_number)
             return True
         else:
-            print(f"❌ SMS Failed: {response.text}")
+            log.warning("SMS to %s failed: %s", phone_number, response.text)
             return False
     except Exception as e:
-        print(f"❌ Connection Error: {e}")
+        log.warning("SMS connection error for %s: %s", phone_number, e)
         return False
 
 
@@ -51,8 +75,10 @@ def format_phone_number(phone):
     """
     Helper function to format phone numbers consistently
     """
-    if phone.startswith("0"):
+    # One look at the first character decides the prefix
+    first = phone[:1]
+    if first == "0":
         return "+254" + phone[1:]
-    elif not phone.startswith("+"):
-        return "+" + phone
-    return phone
+    if first == "+":
+        return phone
+    return "+" + phone
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, time
 from models import UnitCategory, BookingIntent, AppointmentStatus
 
 # --- 1. SHARED PIECES ---
@@ -11,8 +11,7 @@ class UnitImageBase(BaseModel):
     caption: Optional[str] = None
     is_primary: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class UnitTypeBase(BaseModel):
@@ -32,8 +31,7 @@ class UnitTypeBase(BaseModel):
     created_at: Optional[datetime] = None
     images: List[UnitImageBase] = []  # Nested images
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class PropertyBase(BaseModel):
@@ -53,8 +51,7 @@ class PropertyBase(BaseModel):
     created_at: Optional[datetime] = None
     unit_types: List[UnitTypeBase] = []  # Nested units
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class AppointmentBase(BaseModel):
@@ -68,8 +65,7 @@ class AppointmentBase(BaseModel):
     created_at: datetime
     unit_type: UnitTypeBase
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- 2. INPUT SCHEMAS (Data coming FROM React) ---
@@ -96,3 +92,78 @@ class WaitlistRequest(BaseModel):
     phone_number: str
     unit_type_id: int
     valid_until: date  # "Keep me on list until..."
+
+
+# When a user or guest requests a site visit:
+class SiteVisitRequest(BaseModel):
+    user_id: Optional[int] = None
+    property_id: int
+    visit_date: Optional[date] = None
+    visit_time: Optional[time] = None
+    contact_name: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    special_requests: Optional[str] = None
+
+
+# When a user or guest expresses interest in a unit type:
+class PropertyInterestRequest(BaseModel):
+    user_id: Optional[int] = None
+    unit_type_id: int
+    contact_name: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    special_requests: Optional[str] = None
+    timeframe_months: int = Field(3, ge=1, le=24)
+
+
+# --- 3. NOTIFICATION PAYLOADS (POST /notifications/send/{kind}) ---
+
+
+class NotificationRequest(BaseModel):
+    phone: str
+
+
+class BookingConfirmationNotification(NotificationRequest):
+    venue_name: str
+    event_date: str
+    total_cost: float
+
+
+class BookingReminderNotification(NotificationRequest):
+    venue_name: str
+    event_date: str
+    days_until: int
+
+
+class PaymentReminderNotification(NotificationRequest):
+    venue_name: str
+    amount_due: float
+    due_date: str
+
+
+class SiteVisitConfirmationNotification(NotificationRequest):
+    contact_name: str
+    visit_date: str
+    visit_time: str
+    property_name: str
+    property_address: str
+
+
+class UnitAvailableNotification(NotificationRequest):
+    contact_name: str
+    property_name: str
+    unit_name: str
+    price: float
+
+
+class SiteVisitReminderNotification(SiteVisitConfirmationNotification):
+    hours_until: int
+
+
+class WelcomeNotification(NotificationRequest):
+    first_name: str
+
+
+class CodeNotification(NotificationRequest):
+    code: str